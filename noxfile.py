@@ -85,6 +85,7 @@ def test(session: nox.Session):
         "--cov=antsibull_core",
         "--cov-report",
         "term-missing",
+        "--numprocesses=auto",
         *more_args,
         *session.posargs,
         env={"COVERAGE_FILE": f"{covfile}", **session.env},
@@ -11,15 +11,15 @@ Classes to encapsulate collection metadata from collection-meta.yaml
 
 from __future__ import annotations
 
+import functools
 import os
 import typing as t
 from collections.abc import Collection
 
 import pydantic as p
-from antsibull_fileutils.yaml import load_yaml_file
 from packaging.version import Version as PypiVer
 
-from .pydantic import forbid_extras, get_formatted_error_messages
+from .pydantic import _modify_config, forbid_extras, get_formatted_error_messages
 from .schemas.collection_meta import (
     BaseRemovalInformation,
     CollectionMetadata,
@@ -29,6 +29,7 @@ from .schemas.collection_meta import (
     RemovedCollectionMetadata,
     RemovedRemovalInformation,
 )
+from .yaml import load_yaml_file
 
 if t.TYPE_CHECKING:
     from _typeshed import StrPath
@@ -272,6 +273,24 @@ class _Validator:
         self._validate_removed_collections(data)
 
 
+@functools.cache
+def _get_model_classes(model: type[p.BaseModel]) -> frozenset[type[p.BaseModel]]:
+    # The models that make up a model tree do not change, only their configuration does
+    classes: set[type[p.BaseModel]] = set()
+    _modify_config(model, classes, lambda model_config: False)
+    return frozenset(classes)
+
+
+def _ensure_forbid_extras(model: type[p.BaseModel]) -> None:
+    # Walking the model tree is much more expensive than validating a typical
+    # collection-meta.yaml, so only do it if a model does not forbid extras already,
+    # for example after set_extras() was called for it
+    if any(
+        cls.model_config.get("extra") != "forbid" for cls in _get_model_classes(model)
+    ):
+        forbid_extras(model)
+
+
 def lint_collection_meta(
     *, collection_meta_path: StrPath, major_release: int, all_collections: list[str]
 ) -> list[str]:
@@ -289,7 +308,7 @@ def lint_collection_meta(
         major_release=major_release,
     )
 
-    forbid_extras(CollectionsMetadata)
+    _ensure_forbid_extras(CollectionsMetadata)
 
     try:
         parsed_data = CollectionsMetadata.model_validate(data)
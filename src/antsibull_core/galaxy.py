@@ -15,11 +15,11 @@ from urllib.parse import urljoin
 
 import aiofiles
 import semantic_version as semver
-from antsibull_fileutils.hashing import verify_hash
-from antsibull_fileutils.io import copy_file
 
 from . import app_context
+from .utils.hashing import verify_hash
 from .utils.http import retry_get
+from .utils.io import copy_file
 
 # The type checker can handle finding aiohttp.client but flake8 cannot :-(
 if t.TYPE_CHECKING:
@@ -377,18 +377,11 @@ class CollectionDownloader(GalaxyClient):
         namespace, name = collection.split(".", 1)
         filename = f"{namespace}-{name}-{version}.tar.gz"
         download_filename = os.path.join(self.download_dir, filename)
-        lib_ctx = app_context.lib_ctx.get()
 
         if self.collection_cache and self.trust_collection_cache:
             cached_copy = os.path.join(self.collection_cache, filename)
             if os.path.isfile(cached_copy):
-                await copy_file(
-                    cached_copy,
-                    download_filename,
-                    check_content=False,
-                    file_check_content=lib_ctx.file_check_content,
-                    chunksize=lib_ctx.chunksize,
-                )
+                await copy_file(cached_copy, download_filename, check_content=False)
                 return download_filename
 
         release_info = await self.get_release_info(f"{namespace}/{name}", version)
@@ -399,17 +392,8 @@ class CollectionDownloader(GalaxyClient):
         if self.collection_cache:
             cached_copy = os.path.join(self.collection_cache, filename)
             if os.path.isfile(cached_copy):
-                lib_ctx = app_context.lib_ctx.get()
-                if await verify_hash(
-                    cached_copy, sha256sum, chunksize=lib_ctx.chunksize
-                ):
-                    await copy_file(
-                        cached_copy,
-                        download_filename,
-                        check_content=False,
-                        file_check_content=lib_ctx.file_check_content,
-                        chunksize=lib_ctx.chunksize,
-                    )
+                if await verify_hash(cached_copy, sha256sum):
+                    await copy_file(cached_copy, download_filename, check_content=False)
                     return download_filename
 
         async with retry_get(
@@ -424,9 +408,7 @@ class CollectionDownloader(GalaxyClient):
                     await f.write(chunk)
 
         # Verify the download
-        if not await verify_hash(
-            download_filename, sha256sum, chunksize=lib_ctx.chunksize
-        ):
+        if not await verify_hash(download_filename, sha256sum):
             raise DownloadFailure(
                 f"{release_url} failed to download correctly."
                 f" Expected checksum: {sha256sum}"
@@ -435,13 +417,7 @@ class CollectionDownloader(GalaxyClient):
         # Copy downloaded collection into cache
         if self.collection_cache:
             cached_copy = os.path.join(self.collection_cache, filename)
-            await copy_file(
-                download_filename,
-                cached_copy,
-                check_content=False,
-                file_check_content=lib_ctx.file_check_content,
-                chunksize=lib_ctx.chunksize,
-            )
+            await copy_file(download_filename, cached_copy, check_content=False)
 
         return download_filename
 
@@ -80,8 +80,8 @@ def forbid_extras(models: type[p.BaseModel] | Collection[type[p.BaseModel]]) ->
 
 
 def get_formatted_error_messages(error: p.ValidationError) -> list[str]:
-    def format_error(err) -> str:
-        location = " -> ".join(str(loc) for loc in err["loc"])
-        return f'{location}: {err["msg"]}'
-
-    return [format_error(err) for err in error.errors()]
+    # Only location and message are needed, so skip building URLs and context
+    return [
+        f'{" -> ".join(map(str, err["loc"]))}: {err["msg"]}'
+        for err in error.errors(include_url=False, include_context=False)
+    ]
@@ -15,11 +15,12 @@ import os
 import typing as t
 
 import pydantic as p
-from antsibull_fileutils.yaml import load_yaml_file
 from packaging.version import Version as PypiVer
 from pydantic.functional_validators import BeforeValidator
 from typing_extensions import Annotated, Self
 
+from ..yaml import load_yaml_file
+
 if t.TYPE_CHECKING:
     from _typeshed import StrPath
 
@@ -80,6 +80,9 @@ class LibContext(BaseModel):
         cache contains an artifact, it is the current one available on PyPI. This avoids making a
         request to PyPI to figure out the artifact's checksum and comparing it before trusting
         the cached artifact.
+    :ivar venv_template_cache: If set, must be a path pointing to a directory where template venvs
+        are cached. ``VenvRunner`` then copies a template instead of creating a new venv and
+        upgrading pip in it every time. Remove the directory to get a newer pip version.
     """
 
     chunksize: int = 4096
@@ -95,12 +98,13 @@ class LibContext(BaseModel):
     trust_collection_cache: bool = False
     ansible_core_cache: t.Optional[str] = None
     trust_ansible_core_cache: bool = False
+    venv_template_cache: t.Optional[str] = None
 
     # pylint: disable-next=unused-private-member
     __convert_nones = p.field_validator("process_max", mode="before")(convert_none)
     # pylint: disable-next=unused-private-member
     __convert_paths = p.field_validator(
-        "ansible_core_cache", "collection_cache", mode="before"
+        "ansible_core_cache", "collection_cache", "venv_template_cache", mode="before"
     )(convert_path)
     # pylint: disable-next=unused-private-member
     __convert_bools = p.field_validator(
@@ -52,6 +52,65 @@ async def _sync_or_async(
     return cast("_T", out)
 
 
+class BatchedLogCallback:
+    """
+    Output callback that collects lines and passes them on in batches.
+
+    Pass an instance as ``stdout_loglevel`` or ``stderr_loglevel`` to
+    :func:`async_log_run` or :func:`log_run` to log verbose output with one call per
+    ``batch_size`` lines instead of one call per line. Remaining lines are passed on when
+    the output ends.
+    """
+
+    def __init__(
+        self, callback: OutputCallbackType, batch_size: int = 64, prefix: str = ""
+    ) -> None:
+        """
+        :arg callback: Called with the collected lines, joined by newlines.
+        :kwarg batch_size: Number of lines to collect before calling ``callback``.
+        :kwarg prefix: Prefix added to every line.
+        """
+        self.callback = callback
+        self.batch_size = batch_size
+        self.prefix = prefix
+        self._lines: list[str] = []
+
+    @classmethod
+    def from_loglevel(
+        cls,
+        loglevel: str,
+        logger: TwiggyLogger | StdLogger | None = None,
+        batch_size: int = 64,
+        name: str = "output",
+    ) -> BatchedLogCallback:
+        """
+        Create a callback that logs batches of lines to ``logger`` with the given level.
+
+        :arg loglevel: The level to log with, for example ``debug``.
+        :kwarg logger: The logger to log to. Defaults to this module's logger.
+        :kwarg batch_size: Number of lines to collect before logging them.
+        :kwarg name: Name of the output, used to prefix every line, for example ``stderr``.
+        """
+        logfunc, prefix = _get_log_func_and_prefix(name, loglevel, logger or mlog)
+        return cls(cast("OutputCallbackType", logfunc), batch_size, prefix)
+
+    def __call__(self, line: str, /) -> Any:
+        self._lines.append(f"{self.prefix}{line}")
+        if len(self._lines) >= self.batch_size:
+            return self.flush()
+        return None
+
+    def flush(self) -> Any:
+        """
+        Pass on all collected lines.
+        """
+        if not self._lines:
+            return None
+        text = "\n".join(self._lines)
+        self._lines.clear()
+        return self.callback(text)
+
+
 async def _stream_log(
     name: str,
     callback: OutputCallbackType | None,
@@ -84,6 +143,8 @@ async def _stream_log(
         if callback:
             await _sync_or_async(callback, f"{name}{text.strip()}")
         lines.append(text)
+    if isinstance(callback, BatchedLogCallback):
+        await _sync_or_async(callback.flush)
     return "".join(lines)
 
 
@@ -143,6 +204,10 @@ async def async_log_run(
         command returns a non-zero exit code
     :param errors:
         How to handle UTF-8 decoding errors. Default is ``strict``.
+
+    Other keyword arguments are passed to :func:`asyncio.create_subprocess_exec`. For
+    example, pass ``close_fds=False`` to spawn the process a bit faster if it cannot
+    inherit any file descriptors that it should not have access to.
     """
     logger = logger or mlog
     stdout_logfunc, stdout_log_prefix = _get_log_func_and_prefix(
@@ -204,6 +269,7 @@ def log_run(
 
 
 __all__ = (
+    "BatchedLogCallback",
     "async_log_run",
     "log_run",
     "CalledProcessError",
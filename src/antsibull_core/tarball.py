@@ -7,6 +7,7 @@
 
 from __future__ import annotations
 
+import os.path
 import re
 import typing as t
 
@@ -15,8 +16,17 @@ from antsibull_core.subprocess_util import async_log_run
 if t.TYPE_CHECKING:
     from _typeshed import StrPath
 
-#: Regex to find toplevel directories in tar output
-TOPLEVEL_RE: re.Pattern = re.compile("^[^/]+/$")
+#: Regex to find toplevel directories in tar output. Can be used to match single lines,
+#: or to search the whole output at once.
+TOPLEVEL_RE: re.Pattern = re.compile("^[^/\n]+/$", re.MULTILINE)
+
+#: Supported tarball suffixes, mapped to the tar flag for their compression.
+_TARBALL_SUFFIXES: dict[str, str] = {
+    ".tar.gz": "z",
+    ".tgz": "z",
+    ".tar.bz2": "j",
+    ".tar.xz": "J",
+}
 
 
 class InvalidTarball(Exception):
@@ -33,23 +43,29 @@ async def unpack_tarball(tarname: StrPath, destdir: StrPath) -> str:
         a subdirectory of `destdir`.
     """
     tarname_str = str(tarname)
-    manifest = await async_log_run(["tar", "-xzvf", tarname_str, f"-C{destdir}"])
-    toplevel_dirs = [
-        filename
-        for filename in manifest.stdout.splitlines()
-        if TOPLEVEL_RE.match(filename)
-    ]
+    basename = os.path.basename(tarname_str)
+    for suffix, compression_flag in _TARBALL_SUFFIXES.items():
+        if basename.endswith(suffix):
+            break
+    else:
+        raise InvalidTarball(f"The tarball {tarname} does not have a known suffix")
+
+    manifest = await async_log_run(
+        ["tar", f"-x{compression_flag}vf", tarname_str, f"-C{destdir}"]
+    )
+    toplevel_dirs = set(TOPLEVEL_RE.findall(manifest.stdout))
 
     if len(toplevel_dirs) != 1:
         raise InvalidTarball(
             f"The tarball {tarname} had more than a single toplevel dir"
         )
 
-    expected_dirname = tarname_str[: -len(".tar.gz")]
-    if toplevel_dirs[0] != expected_dirname:
+    toplevel_dir = toplevel_dirs.pop()
+    expected_dirname = basename[: -len(suffix)]
+    if toplevel_dir[:-1] != expected_dirname:
         raise InvalidTarball(f"The directory in {tarname} was not {expected_dirname}")
 
-    return toplevel_dirs[0]
+    return toplevel_dir
 
 
 async def pack_tarball(tarname: StrPath, directory: str) -> str:
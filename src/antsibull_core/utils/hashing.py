@@ -7,11 +7,12 @@
 
 from __future__ import annotations
 
+import asyncio
+import dataclasses
+import hashlib
+import mmap
 import typing as t
-from collections.abc import Mapping
-
-from antsibull_fileutils.hashing import verify_a_hash as _verify_a_hash
-from antsibull_fileutils.hashing import verify_hash as _verify_hash
+from collections.abc import Iterable, Mapping
 
 from .. import app_context
 
@@ -19,6 +20,38 @@ if t.TYPE_CHECKING:
     from _typeshed import StrOrBytesPath
 
 
+@dataclasses.dataclass(frozen=True)
+class _AlgorithmData:
+    name: str
+    algorithm: str
+    kwargs: dict[str, t.Any]
+
+
+_PREFERRED_HASHES: tuple[_AlgorithmData, ...] = (
+    # https://pypi.org/help/#verify-hashes, https://github.com/pypi/warehouse/issues/9628
+    _AlgorithmData(name="sha256", algorithm="sha256", kwargs={}),
+    _AlgorithmData(name="blake2b_256", algorithm="blake2b", kwargs={"digest_size": 32}),
+)
+
+
+def _sync_hash_file(
+    filename: StrOrBytesPath,
+    algorithm: str,
+    algorithm_kwargs: dict[str, t.Any],
+    chunksize: int,
+) -> str:
+    hasher = getattr(hashlib, algorithm)(**algorithm_kwargs)
+    with open(filename, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hasher.update(mm)
+        except (ValueError, OSError):
+            # Empty files and special files cannot be mapped
+            while chunk := f.read(chunksize):
+                hasher.update(chunk)
+    return hasher.hexdigest()
+
+
 async def verify_hash(
     filename: StrOrBytesPath,
     hash_digest: str,
@@ -36,13 +69,10 @@ async def verify_hash(
     :returns: True if the hash matches, otherwise False.
     """
     ctx = app_context.lib_ctx.get()
-    return await _verify_hash(
-        filename,
-        hash_digest,
-        algorithm=algorithm,
-        algorithm_kwargs=algorithm_kwargs,
-        chunksize=ctx.chunksize,
+    digest = await asyncio.to_thread(
+        _sync_hash_file, filename, algorithm, algorithm_kwargs or {}, ctx.chunksize
     )
+    return digest == hash_digest
 
 
 async def verify_a_hash(
@@ -56,5 +86,43 @@ async def verify_a_hash(
     :arg hash_digest: A mapping of hash types to digests.
     :returns: True if the hash matches, otherwise False.
     """
-    ctx = app_context.lib_ctx.get()
-    return await _verify_a_hash(filename, hash_digests, chunksize=ctx.chunksize)
+    for algorithm_data in _PREFERRED_HASHES:
+        if algorithm_data.name in hash_digests:
+            return await verify_hash(
+                filename,
+                hash_digests[algorithm_data.name],
+                algorithm=algorithm_data.algorithm,
+                algorithm_kwargs=algorithm_data.kwargs,
+            )
+    return False
+
+
+async def verify_many(
+    files_and_digests: Iterable[tuple[StrOrBytesPath, Mapping[str, str]]],
+    concurrency: int | None = None,
+) -> list[bool]:
+    """
+    Verify the hashes of several files concurrently. See :func:`verify_a_hash` for details.
+
+    :arg files_and_digests: Pairs of a file to verify and a mapping of hash types to digests.
+    :kwarg concurrency: Maximum number of files to verify at the same time. The default is
+        ``lib_ctx.thread_max``.
+    :returns: For every file in ``files_and_digests``, in the same order, True if the hash
+        matches, otherwise False.
+    """
+    if concurrency is None:
+        ctx = app_context.lib_ctx.get()
+        concurrency = ctx.thread_max
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _verify(
+        filename: StrOrBytesPath, hash_digests: Mapping[str, str]
+    ) -> bool:
+        async with semaphore:
+            return await verify_a_hash(filename, hash_digests)
+
+    verifiers = [
+        asyncio.create_task(_verify(filename, hash_digests))
+        for filename, hash_digests in files_and_digests
+    ]
+    return list(await asyncio.gather(*verifiers))
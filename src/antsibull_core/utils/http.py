@@ -8,7 +8,7 @@
 from __future__ import annotations
 
 import asyncio
-import math
+import functools
 import random
 import typing as t
 import warnings
@@ -25,6 +25,9 @@ mlog = log.fields(mod=__name__)
 # Since Python 3.11 asyncio.TimeoutError is a deprecated alias of TimeoutError
 _AsyncIoTimeoutError = getattr(asyncio, "TimeoutError", TimeoutError)  # pyre-ignore[16]
 
+# ClientTimeout is immutable, so a single instance can be shared by all requests
+_REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=20)
+
 
 def _format_call(
     command: str, args: tuple[t.Any, ...], kwargs: Mapping[str, t.Any]
@@ -33,6 +36,32 @@ def _format_call(
     return f'aio_session.{command}({", ".join(arguments)})'
 
 
+class _FormattedCall:
+    """
+    Formats a call with ``_format_call()`` the first time it is converted to a string.
+    """
+
+    __slots__ = ("command", "args", "kwargs", "_formatted")
+
+    def __init__(
+        self, command: str, args: tuple[t.Any, ...], kwargs: Mapping[str, t.Any]
+    ):
+        self.command = command
+        self.args = args
+        self.kwargs = kwargs
+        self._formatted: str | None = None
+
+    def __str__(self) -> str:
+        if self._formatted is None:
+            self._formatted = _format_call(self.command, self.args, self.kwargs)
+        return self._formatted
+
+
+@functools.cache
+def _get_backoff_factors(max_retries: int) -> tuple[float, ...]:
+    return tuple(1.5**retry for retry in range(max_retries))
+
+
 class RetryGetManager:
     response: aiohttp.ClientResponse | None
 
@@ -49,8 +78,13 @@ class RetryGetManager:
         self.kwargs = kwargs
         self.max_retries = max_retries
         self.acceptable_error_codes = acceptable_error_codes
-        self.call_string = _format_call("get", args, kwargs)
+        self._call = _FormattedCall("get", args, kwargs)
         self.response = None
+        self._backoff_factors = _get_backoff_factors(max_retries)
+
+    @property
+    def call_string(self) -> str:
+        return str(self._call)
 
     async def __aenter__(self) -> aiohttp.ClientResponse:
         flog = mlog.fields(func="RetryGetManager.__aenter__")
@@ -58,11 +92,11 @@ class RetryGetManager:
 
         errors = []
         for retry in range(self.max_retries):
-            flog.debug("Execute {0}", self.call_string)
+            flog.debug("Execute {0}", self._call)
             wait_factor: float = 5
             try:
                 response = await self.aio_session.get(  # pyre-ignore[16]
-                    *self.args, **self.kwargs, timeout=aiohttp.ClientTimeout(total=20)
+                    *self.args, **self.kwargs, timeout=_REQUEST_TIMEOUT
                 )
                 status_code = response.status
                 flog.debug(f"Status code {status_code}")
@@ -81,18 +115,20 @@ class RetryGetManager:
                 status = str(error)
 
             errors.append(status)
-            failed = retry + 1 == self.max_retries
-            warnings.warn(
-                f"{self.call_string} failed with status code {status}"
-                f'{", finally failed." if failed else ", retrying..."}'
-            )
-            if failed:
+            if retry + 1 == self.max_retries:
                 break
+            flog.warning(
+                "{0} failed with status code {1}, retrying...", self._call, status
+            )
 
             await asyncio.sleep(
-                math.pow(1.5, retry) * wait_factor + (0.5 + random.uniform(0, 1))
+                self._backoff_factors[retry] * wait_factor + 0.5 + random.random()
             )
 
+        warnings.warn(
+            f"{self.call_string} failed {len(errors)} times with status codes"
+            f' {", ".join(errors)}, finally failed.'
+        )
         flog.debug("Raise error")
         raise RuntimeError(
             f"Repeated error when calling {self.call_string}: received status codes "
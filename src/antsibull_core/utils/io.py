@@ -7,12 +7,11 @@
 
 from __future__ import annotations
 
+import asyncio
+import os
+import shutil
 import typing as t
 
-from antsibull_fileutils.io import copy_file as _copy_file
-from antsibull_fileutils.io import read_file as _read_file
-from antsibull_fileutils.io import write_file as _write_file
-
 from .. import app_context
 from ..logging import log
 
@@ -22,32 +21,150 @@ if t.TYPE_CHECKING:
 mlog = log.fields(mod=__name__)
 
 
+def _is_up_to_date(
+    stat_s: os.stat_result, dest_path: StrOrBytesPath, trust_size_and_mtime: bool
+) -> bool:
+    try:
+        stat_d = os.stat(dest_path)
+    except FileNotFoundError:
+        return False
+    if stat_s.st_dev == stat_d.st_dev and stat_s.st_ino == stat_d.st_ino:
+        # Source and destination are the same file (for example a hardlink)
+        return True
+    return (
+        trust_size_and_mtime
+        and stat_s.st_size == stat_d.st_size
+        and stat_s.st_mtime_ns == stat_d.st_mtime_ns
+    )
+
+
 async def copy_file(
-    source_path: StrOrBytesPath, dest_path: StrOrBytesPath, check_content: bool = True
+    source_path: StrOrBytesPath,
+    dest_path: StrOrBytesPath,
+    check_content: bool = True,
+    *,
+    trust_size_and_mtime: bool = False,
 ) -> None:
     """
     Copy content from one file to another.
 
+    If source and destination are the same file, nothing is copied.
+
     :arg source_path: Source path. Must be a file.
     :arg dest_path: Destination path.
     :kwarg check_content: If ``True`` (default) and ``lib_ctx.file_check_content > 0`` and the
         destination file exists, first check whether source and destination are potentially equal
         before actually copying,
+    :kwarg trust_size_and_mtime: If ``True`` and ``check_content`` is ``True``, assume that the
+        destination is up-to-date if it has the same size and modification time as the source,
+        without comparing their contents. The source's modification time is copied to the
+        destination so that later calls can skip copying.
     """
     lib_ctx = app_context.lib_ctx.get()
-    await _copy_file(
+    stat_s = os.stat(source_path)
+    if _is_up_to_date(stat_s, dest_path, check_content and trust_size_and_mtime):
+        return
+    # Do all of the file I/O in a single worker thread instead of one hop per read or write
+    await asyncio.to_thread(
+        _sync_copy_file,
+        stat_s,
         source_path,
         dest_path,
-        check_content=check_content,
-        file_check_content=lib_ctx.file_check_content,
-        chunksize=lib_ctx.chunksize,
+        check_content,
+        lib_ctx.file_check_content,
+        lib_ctx.chunksize,
     )
+    if check_content and trust_size_and_mtime:
+        os.utime(dest_path, ns=(stat_s.st_atime_ns, stat_s.st_mtime_ns))
+
+
+def _sync_copy_file(
+    stat_s: os.stat_result,
+    source_path: StrOrBytesPath,
+    dest_path: StrOrBytesPath,
+    check_content: bool,
+    file_check_content: int,
+    chunksize: int,
+) -> None:
+    if (
+        check_content
+        and 0 < file_check_content
+        and stat_s.st_size <= file_check_content
+    ):
+        # Check whether the destination file exists and has the same content as the source file,
+        # in which case we won't overwrite the destination file
+        try:
+            stat_d = os.stat(dest_path)
+            if stat_d.st_size == stat_s.st_size:
+                with open(source_path, "rb") as f_in:
+                    content_to_copy = f_in.read()
+                if _has_content(dest_path, content_to_copy, chunksize):
+                    return
+                # Since we already read the contents of the file to copy, simply write it to
+                # the destination instead of reading it again
+                with open(dest_path, "wb") as f_out:
+                    f_out.write(content_to_copy)
+                return
+        except FileNotFoundError:
+            # Destination file does not exist
+            pass
+
+    with open(source_path, "rb") as f_in, open(dest_path, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out, chunksize)
+
+
+def _has_content(filename: StrOrBytesPath, content: bytes, chunksize: int) -> bool:
+    # Compare chunk by chunk so that we can stop at the first difference, and never have to
+    # keep a second copy of the whole content in memory
+    view = memoryview(content)
+    offset = 0
+    with open(filename, "rb") as f:
+        while chunk := f.read(chunksize):
+            if chunk != view[offset : offset + len(chunk)]:
+                return False
+            offset += len(chunk)
+    return offset == len(content)
+
+
+def _sync_write_file(
+    filename: StrOrBytesPath,
+    content_bytes: bytes,
+    file_check_content: int,
+    chunksize: int,
+) -> None:
+    if 0 < file_check_content and len(content_bytes) <= file_check_content:
+        # Check whether the destination file exists and has the same content as the one we want
+        # to write, in which case we won't overwrite the file
+        try:
+            stat = os.stat(filename)
+            if stat.st_size == len(content_bytes) and _has_content(
+                filename, content_bytes, chunksize
+            ):
+                return
+        except FileNotFoundError:
+            # Destination file does not exist
+            pass
+
+    with open(filename, "wb") as f:
+        f.write(content_bytes)
 
 
 async def write_file(filename: StrOrBytesPath, content: str) -> None:
     lib_ctx = app_context.lib_ctx.get()
-    await _write_file(filename, content, file_check_content=lib_ctx.file_check_content)
+    content_bytes = content.encode("utf-8")
+    await asyncio.to_thread(
+        _sync_write_file,
+        filename,
+        content_bytes,
+        lib_ctx.file_check_content,
+        lib_ctx.chunksize,
+    )
+
+
+def _sync_read_file(filename: StrOrBytesPath, encoding: str) -> str:
+    with open(filename, "r", encoding=encoding) as f:
+        return f.read()
 
 
 async def read_file(filename: StrOrBytesPath, encoding: str = "utf-8") -> str:
-    return await _read_file(filename, encoding=encoding)
+    return await asyncio.to_thread(_sync_read_file, filename, encoding)
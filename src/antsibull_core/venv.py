@@ -8,22 +8,85 @@
 from __future__ import annotations
 
 import asyncio
+import atexit
+import hashlib
+import importlib.metadata
 import os
+import shutil
+import subprocess
 import sys
+import sysconfig
+import tempfile
+import threading
+import uuid
 import venv
 from collections.abc import Sequence
 from typing import TYPE_CHECKING, NoReturn
 
-from antsibull_core import subprocess_util
+from packaging.version import InvalidVersion
+from packaging.version import Version as PypiVer
+
+from antsibull_core import app_context, subprocess_util
+from antsibull_core.logging import log
 
 if TYPE_CHECKING:
-    import subprocess
     from logging import Logger as StdLogger
 
     from _typeshed import StrPath
     from twiggy.logger import Logger as TwiggyLogger  # type: ignore[import]
 
 
+mlog = log.fields(mod=__name__)
+
+#: Minimum pip version a venv needs. Older versions are upgraded when creating a venv.
+#: Set the environment variable ``ANTSIBULL_FORCE_PIP_UPGRADE`` to always upgrade pip.
+_MIN_PIP = PypiVer("19.3")
+
+
+class _RunnerLoop:
+    """
+    Owns the event loop that ``_get_runner_loop()`` returns in one thread.
+
+    It is only referenced from thread-local storage, which is cleared when the thread
+    finishes. The loop is closed at that point.
+    """
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+
+    def __del__(self) -> None:
+        self.loop.close()
+
+
+_runner_loops = threading.local()
+
+
+def _get_runner_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return an event loop for running commands synchronously.
+
+    The loop is created on first use and reused by all later calls from the same thread,
+    instead of creating and tearing down a new loop for every command.
+    """
+    runner_loop: _RunnerLoop | None = getattr(_runner_loops, "runner_loop", None)
+    if runner_loop is None or runner_loop.loop.is_closed():
+        runner_loop = _RunnerLoop()
+        _runner_loops.runner_loop = runner_loop
+    return runner_loop.loop
+
+
+def _close_runner_loop() -> None:
+    # The main thread's thread-local storage is only cleared late during interpreter
+    # shutdown, so drop its loop at exit. This runs in the main thread.
+    try:
+        del _runner_loops.runner_loop
+    except AttributeError:
+        pass
+
+
+atexit.register(_close_runner_loop)
+
+
 def get_clean_environment() -> dict[str, str]:
     env = os.environ.copy()
     try:
@@ -35,6 +98,125 @@ def get_clean_environment() -> dict[str, str]:
     return env
 
 
+def _sync_run(args: list[str], env: dict[str, str]) -> None:
+    """
+    Run a command without an event loop, log its stderr, and raise
+    ``subprocess.CalledProcessError`` if it fails.
+    """
+    flog = mlog.fields(func="_sync_run")
+    flog.debug(f"Running subprocess: {args!r}")
+    result = subprocess.run(
+        args, capture_output=True, env=env, check=False, encoding="utf-8"
+    )
+    for line in result.stderr.splitlines():
+        flog.debug("stderr: {0}", line)
+    result.check_returncode()
+
+
+def _get_pip_version(venv_dir: str) -> PypiVer | None:
+    """
+    Return the version of pip installed in a venv, or ``None`` if it cannot be determined.
+    """
+    scheme = "venv" if "venv" in sysconfig.get_scheme_names() else "posix_prefix"
+    site_packages = sysconfig.get_path(
+        "purelib", scheme, vars={"base": venv_dir, "platbase": venv_dir}
+    )
+    for dist in importlib.metadata.distributions(name="pip", path=[site_packages]):
+        try:
+            return PypiVer(dist.version)
+        except InvalidVersion:
+            return None
+    return None
+
+
+def _create_venv(venv_dir: str) -> None:
+    venv.create(venv_dir, symlinks=True, with_pip=True)
+
+    # Upgrade pip to the latest version if it is too old.
+    # Note that cryptography stopped building manylinux1 wheels (the only ship manylinux2010) so
+    # we need pip19+ in order to work now.  RHEL8 and Ubuntu 18.04 contain a pip that's older
+    # than that so we must upgrade to something even if it's not latest.
+    if not os.environ.get("ANTSIBULL_FORCE_PIP_UPGRADE"):
+        pip_version = _get_pip_version(venv_dir)
+        if pip_version is not None and pip_version >= _MIN_PIP:
+            return
+
+    pip = os.path.join(venv_dir, "bin", "pip")
+    _sync_run([pip, "install", "--upgrade", "pip"], env=get_clean_environment())
+
+
+def _remove_in_background(path: str) -> None:
+    """
+    Move ``path`` out of the way and delete it in a background thread.
+
+    Only directories are removed this way. For anything else, :func:`shutil.rmtree`
+    is called directly so that it raises an error.
+    """
+    if os.path.islink(path) or not os.path.isdir(path):
+        shutil.rmtree(path)
+        return
+    parent, name = os.path.split(path)
+    old_path = os.path.join(parent, f".{name}.old-{uuid.uuid4().hex}")
+    try:
+        os.rename(path, old_path)
+    except OSError:
+        shutil.rmtree(path)
+        return
+    # Not a daemon thread, so that the deletion is finished before the interpreter exits
+    threading.Thread(
+        target=shutil.rmtree, args=(old_path,), kwargs={"ignore_errors": True}
+    ).start()
+
+
+def _get_template_dir(template_cache: str) -> str:
+    # Templates depend on the Python interpreter the venv is created from
+    interpreter = hashlib.sha256(os.fsencode(sys.executable)).hexdigest()[:16]
+    return os.path.join(template_cache, f"{sys.implementation.cache_tag}-{interpreter}")
+
+
+def _rewrite_prefix(venv_dir: str, old_prefix: str, new_prefix: str) -> None:
+    """
+    Replace the absolute path of a venv in its configuration, scripts, and entrypoints.
+    """
+    old = os.fsencode(old_prefix)
+    new = os.fsencode(new_prefix)
+    bin_dir = os.path.join(venv_dir, "bin")
+    paths = [os.path.join(venv_dir, "pyvenv.cfg")]
+    paths.extend(os.path.join(bin_dir, filename) for filename in os.listdir(bin_dir))
+    for path in paths:
+        if os.path.islink(path) or not os.path.isfile(path):
+            continue
+        with open(path, "rb") as f:
+            content = f.read()
+        if old in content:
+            with open(path, "wb") as f:
+                f.write(content.replace(old, new))
+
+
+def _create_template(template_cache: str, template_dir: str) -> None:
+    os.makedirs(template_cache, exist_ok=True)
+    # Build the template next to its final location and move it there once it is
+    # complete, so that other processes never see a partial template
+    tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=template_cache)
+    try:
+        _create_venv(tmp_dir)
+        _rewrite_prefix(tmp_dir, tmp_dir, template_dir)
+        try:
+            os.rename(tmp_dir, template_dir)
+        except OSError:
+            # Another process created the template in the meantime
+            if not os.path.exists(template_dir):
+                raise
+    finally:
+        if os.path.exists(tmp_dir):
+            shutil.rmtree(tmp_dir)
+
+
+def _pip_stderr_callback() -> subprocess_util.BatchedLogCallback:
+    # pip writes a lot of progress output to stderr, so log it in batches of lines
+    return subprocess_util.BatchedLogCallback.from_loglevel("debug", name="stderr")
+
+
 class VenvRunner:
     """
     Makes running a command in a venv easy.
@@ -49,24 +231,49 @@ class VenvRunner:
     top_dir: StrPath
     venv_dir: str
 
-    def __init__(self, name: str, top_dir: StrPath) -> None:
+    def __init__(
+        self, name: str, top_dir: StrPath, *, template_cache: str | None = None
+    ) -> None:
         """
         Create a venv.
 
         :arg name: Name of the venv.
         :arg top_dir: Directory the venv will be created inside of.
+        :kwarg template_cache: If given, a path to a directory containing template venvs.
+            The venv is copied from a template instead of being created from scratch. The
+            template is created first if it does not exist yet.
+            Defaults to ``lib_ctx.get().venv_template_cache``.
         """
         self.name = name
         self.top_dir = top_dir
         self.venv_dir: str = os.path.join(top_dir, name)
-        venv.create(self.venv_dir, clear=True, symlinks=True, with_pip=True)
+        # Maps names of the executables in the venv's bin directory to their paths
+        self._bin_index: dict[str, str] = {}
+
+        if os.path.lexists(self.venv_dir):
+            # Deleting an existing venv can take a while, so do not wait for it
+            _remove_in_background(self.venv_dir)
+
+        if template_cache is None:
+            template_cache = app_context.lib_ctx.get().venv_template_cache
+        if template_cache:
+            self._copy_template(template_cache)
+        else:
+            _create_venv(self.venv_dir)
+        self._scan_bin_dir()
 
-        # Upgrade pip to the latest version.
-        # Note that cryptography stopped building manylinux1 wheels (the only ship manylinux2010) so
-        # we need pip19+ in order to work now.  RHEL8 and Ubuntu 18.04 contain a pip that's older
-        # than that so we must upgrade to something even if it's not latest.
+    def _scan_bin_dir(self) -> None:
+        with os.scandir(os.path.join(self.venv_dir, "bin")) as entries:
+            self._bin_index = {entry.name: entry.path for entry in entries}
 
-        self.log_run(["pip", "install", "--upgrade", "pip"])
+    def _copy_template(self, template_cache: str) -> None:
+        template_dir = _get_template_dir(template_cache)
+        if not os.path.exists(template_dir):
+            _create_template(template_cache, template_dir)
+        # Copy instead of hardlinking, so that installing packages into this venv cannot
+        # modify the template
+        shutil.copytree(template_dir, self.venv_dir, symlinks=True)
+        _rewrite_prefix(self.venv_dir, template_dir, self.venv_dir)
 
     def install_package(self, package_name: str) -> subprocess.CompletedProcess:
         """
@@ -76,7 +283,68 @@ class VenvRunner:
             directly to :command:`pip install`.
         :returns: An :obj:`subprocess.CompletedProcess` for the pip output.
         """
-        return self.log_run(["pip", "install", package_name])
+        return self.install_packages([package_name])
+
+    def install_packages(
+        self, package_names: Sequence[str]
+    ) -> subprocess.CompletedProcess:
+        """
+        Install several python packages into the venv with a single :command:`pip install` call.
+
+        Prefer this over calling :meth:`install_package` for every package, since every
+        call has to start pip and resolve the environment again.
+
+        :arg package_names: Bare package names or paths to files.  They are passed
+            directly to :command:`pip install`.
+        :returns: An :obj:`subprocess.CompletedProcess` for the pip output.
+        :raises ValueError: If ``package_names`` is empty.
+        """
+        if not package_names:
+            raise ValueError("No packages to install were given")
+        result = self.log_run(
+            ["pip", "install", *package_names], stderr_loglevel=_pip_stderr_callback()
+        )
+        # The packages may have added new executables
+        self._scan_bin_dir()
+        return result
+
+    async def async_install_packages_parallel(
+        self, package_names: Sequence[str], concurrency: int | None = None
+    ) -> list[subprocess.CompletedProcess]:
+        """
+        Install python packages into the venv with one concurrent :command:`pip install` call
+        per package.
+
+        Only use this for packages that do not share dependencies. Concurrent pip runs that
+        install the same dependency into the venv can conflict with each other. Otherwise use
+        :meth:`install_packages`.
+
+        :arg package_names: Bare package names or paths to files.  Each is passed directly to
+            its own :command:`pip install`.
+        :kwarg concurrency: Maximum number of pip processes to run at the same time. The default
+            is ``lib_ctx.thread_max``.
+        :returns: A list of :obj:`subprocess.CompletedProcess` for the pip output, in the same
+            order as ``package_names``.
+        """
+        if concurrency is None:
+            concurrency = app_context.lib_ctx.get().thread_max
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _install(package_name: str) -> subprocess.CompletedProcess:
+            async with semaphore:
+                return await self.async_log_run(
+                    ["pip", "install", package_name],
+                    stderr_loglevel=_pip_stderr_callback(),
+                )
+
+        installers = [
+            asyncio.create_task(_install(package_name))
+            for package_name in package_names
+        ]
+        results = list(await asyncio.gather(*installers))
+        # The packages may have added new executables
+        self._scan_bin_dir()
+        return results
 
     async def async_log_run(
         self,
@@ -95,13 +363,14 @@ class VenvRunner:
         do the heavy lifting. `args[0]` must be a filename that's installed in
         the venv. If it's not, a `ValueError` will be raised.
         """
-        kwargs.setdefault("env", get_clean_environment())
+        if "env" not in kwargs:
+            # Only copy the environment if the caller did not provide one
+            kwargs["env"] = get_clean_environment()
         basename = args[0]
-        if os.path.isabs(basename):
-            raise ValueError(f"{basename!r} must not be an absolute path!")
-        path = os.path.join(self.venv_dir, "bin", basename)
-        if not os.path.exists(path):
-            raise ValueError(f"{path!r} does not exist!")
+        # Names in the index never contain a slash, so a hit cannot be an absolute path
+        path = self._bin_index.get(os.fsdecode(basename))
+        if path is None:
+            path = self._find_executable(basename)
         args = [path, *args[1:]]
         return await subprocess_util.async_log_run(
             args,
@@ -113,6 +382,18 @@ class VenvRunner:
             **kwargs,
         )
 
+    def _find_executable(self, basename: StrPath) -> str:
+        if os.path.isabs(basename):
+            raise ValueError(f"{basename!r} must not be an absolute path!")
+        # Executables might have been added since the bin directory was last scanned
+        self._scan_bin_dir()
+        path = self._bin_index.get(os.fsdecode(basename))
+        if path is None:
+            path = os.path.join(self.venv_dir, "bin", basename)
+            if not os.path.exists(path):
+                raise ValueError(f"{path!r} does not exist!")
+        return path
+
     def log_run(
         self,
         args: Sequence[StrPath],
@@ -127,7 +408,7 @@ class VenvRunner:
         """
         See :method:`async_log_run`
         """
-        return asyncio.run(
+        return _get_runner_loop().run_until_complete(
             self.async_log_run(
                 args,
                 logger,
@@ -191,7 +472,7 @@ class FakeVenvRunner:
         """
         See :method:`async_log_run`
         """
-        return asyncio.run(
+        return _get_runner_loop().run_until_complete(
             self.async_log_run(
                 args,
                 logger,
@@ -211,3 +492,23 @@ class FakeVenvRunner:
 
         """
         raise NotImplementedError
+
+    @staticmethod
+    def install_packages(package_names: Sequence[str]) -> NoReturn:
+        """
+        This raises a NotImplementedError and only exists for parity with
+        `VenvRunner`.
+
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    async def async_install_packages_parallel(
+        package_names: Sequence[str], concurrency: int | None = None
+    ) -> NoReturn:
+        """
+        This raises a NotImplementedError and only exists for parity with
+        `VenvRunner`.
+
+        """
+        raise NotImplementedError
@@ -10,8 +10,167 @@ YAML handling.
 
 from __future__ import annotations
 
-# pylint: disable=unused-import
-from antsibull_fileutils.yaml import load_yaml_bytes  # noqa: F401
-from antsibull_fileutils.yaml import load_yaml_file  # noqa: F401
-from antsibull_fileutils.yaml import store_yaml_file  # noqa: F401
-from antsibull_fileutils.yaml import store_yaml_stream  # noqa: F401
+import os
+import pickle
+import threading
+import time
+import typing as t
+from collections import OrderedDict
+from collections.abc import Iterator
+
+import yaml
+
+_SafeLoader: t.Any
+_SafeDumper: t.Any
+try:
+    # use C version if possible for speedup
+    from yaml import CSafeDumper as _SafeDumper
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover
+    if os.environ.get("ANTSIBULL_REQUIRE_LIBYAML"):
+        raise ImportError(
+            "ANTSIBULL_REQUIRE_LIBYAML is set, but PyYAML has not been built with libyaml"
+        ) from None
+    from yaml import SafeDumper as _SafeDumper
+    from yaml import SafeLoader as _SafeLoader
+
+if t.TYPE_CHECKING:
+    from _typeshed import StrOrBytesPath, SupportsWrite
+
+
+class _NoAliasDumper(_SafeDumper):  # pylint:disable=too-many-ancestors
+    """
+    Extend YAML dumper to never emit anchors and aliases.
+    """
+
+    def ignore_aliases(self, data):
+        return True
+
+
+class _IndentedDumper(yaml.SafeDumper):
+    """
+    Extend YAML dumper to increase indent of list items, and to never emit anchors and aliases.
+    """
+
+    def increase_indent(self, flow=False, indentless=False):
+        return super().increase_indent(flow, False)
+
+    def ignore_aliases(self, data):
+        return True
+
+
+def load_yaml_bytes(data: bytes) -> t.Any:
+    """
+    Load and parse YAML from given bytes.
+    """
+    return yaml.load(data, Loader=_SafeLoader)
+
+
+#: Maximum number of parsed files to keep in the cache used by ``load_yaml_file()``.
+_YAML_FILE_CACHE_SIZE = 64
+
+#: Files modified less than this many nanoseconds ago are not cached, since a later
+#: modification might not change the file's modification time.
+_YAML_FILE_CACHE_MIN_AGE = 2_000_000_000
+
+# Maps file identity and modification data to the pickled result of parsing the file.
+# Unpickling is much faster than parsing YAML, and returns a new copy on every call.
+_yaml_file_cache: OrderedDict[tuple[int, ...], bytes] = OrderedDict()
+_yaml_file_cache_lock = threading.Lock()
+
+
+def _rename_mark(mark: yaml.Mark | None, name: str) -> yaml.Mark | None:
+    if mark is None:
+        return None
+    return yaml.Mark(
+        name, mark.index, mark.line, mark.column, mark.buffer, mark.pointer
+    )
+
+
+def load_yaml_file(path: StrOrBytesPath) -> t.Any:
+    """
+    Load and parse YAML file ``path``.
+
+    Results are cached as long as the file does not change, so loading the same file again
+    is cheap. Every call returns a new copy of the data.
+    """
+    with open(path, "rb") as stream:
+        stat = os.fstat(stream.fileno())
+        key = (
+            stat.st_dev,
+            stat.st_ino,
+            stat.st_size,
+            stat.st_mtime_ns,
+            stat.st_ctime_ns,
+        )
+        with _yaml_file_cache_lock:
+            cached = _yaml_file_cache.get(key)
+            if cached is not None:
+                _yaml_file_cache.move_to_end(key)
+        if cached is not None:
+            return pickle.loads(cached)
+
+        # Parse the whole content at once instead of letting the loader read the file in chunks
+        data = stream.read()
+        name = stream.name
+    try:
+        result = load_yaml_bytes(data)
+    except yaml.MarkedYAMLError as exc:
+        # Report the file's name instead of "<byte string>" in error messages
+        exc.context_mark = _rename_mark(exc.context_mark, name)
+        exc.problem_mark = _rename_mark(exc.problem_mark, name)
+        raise
+
+    if time.time_ns() - stat.st_mtime_ns >= _YAML_FILE_CACHE_MIN_AGE:
+        pickled = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+        with _yaml_file_cache_lock:
+            _yaml_file_cache[key] = pickled
+            while len(_yaml_file_cache) > _YAML_FILE_CACHE_SIZE:
+                _yaml_file_cache.popitem(last=False)
+    return result
+
+
+def iter_yaml_documents(path: StrOrBytesPath) -> Iterator[t.Any]:
+    """
+    Load and parse all documents of the YAML file ``path`` one by one.
+
+    The file is streamed to the parser, so only the current document is kept in memory.
+    """
+    with open(path, "rb") as stream:
+        yield from yaml.load_all(stream, Loader=_SafeLoader)
+
+
+def _dump_yaml(
+    content: t.Any, stream: SupportsWrite | None, *, nice: bool, sort_keys: bool
+) -> t.Any:
+    return yaml.dump(
+        content,
+        stream,
+        default_flow_style=False,
+        encoding="utf-8",
+        Dumper=_IndentedDumper if nice else _NoAliasDumper,
+        explicit_start=nice,
+        sort_keys=sort_keys,
+    )
+
+
+def store_yaml_file(
+    path: StrOrBytesPath, content: t.Any, *, nice: bool = False, sort_keys: bool = True
+) -> None:
+    """
+    Store ``content`` as YAML file under ``path``.
+    """
+    # Serialize first and write the result at once, instead of letting the dumper issue
+    # many small writes
+    data = _dump_yaml(content, None, nice=nice, sort_keys=sort_keys)
+    with open(path, "wb") as stream:
+        stream.write(data)
+
+
+def store_yaml_stream(
+    stream: SupportsWrite, content: t.Any, *, nice: bool = False, sort_keys: bool = True
+) -> None:
+    """
+    Dump ``content`` as YAML to an IO ``stream``.
+    """
+    _dump_yaml(content, stream, nice=nice, sort_keys=sort_keys)
@@ -2,12 +2,13 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # SPDX-FileCopyrightText: Ansible Project
 
-import os
 from pathlib import Path
+from unittest import mock
 
 import pytest
 
 from antsibull_core.collection_meta import lint_collection_meta
+from antsibull_core.pydantic import forbid_extras, set_extras
 from antsibull_core.schemas.collection_meta import (
     CollectionMetadata,
     CollectionsMetadata,
@@ -422,29 +423,70 @@ extra_stuff: baz
 ]
 
 
-@pytest.mark.parametrize(
-    "major_release, collection_metadata, all_collections, expected_errors",
-    LINT_COLLECTION_META_DATA,
-)
-def test_lint_collection_meta(
-    major_release: int,
-    collection_metadata: str,
-    all_collections: list[str],
-    expected_errors: list[str],
-    tmp_path: Path,
-):
-    filename = tmp_path / "collection-meta.yaml"
-    filename.write_text(collection_metadata)
+@pytest.fixture(scope="module", params=range(len(LINT_COLLECTION_META_DATA)))
+def lint_collection_meta_case(request: pytest.FixtureRequest):
+    # Encode the YAML payload once per module instead of once per test invocation
+    major_release, metadata, all_collections, expected_errors = (
+        LINT_COLLECTION_META_DATA[request.param]
+    )
+    return major_release, metadata.encode("utf-8"), all_collections, expected_errors
+
+
+@pytest.fixture(scope="module")
+def meta_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    # Shared by all cases of test_lint_collection_meta, which overwrite its content
+    return tmp_path_factory.mktemp("meta") / "collection-meta.yaml"
+
+
+def test_lint_collection_meta(lint_collection_meta_case, meta_file: Path):
+    major_release, collection_metadata, all_collections, expected_errors = (
+        lint_collection_meta_case
+    )
+    meta_file.write_bytes(collection_metadata)
     errors = lint_collection_meta(
-        collection_meta_path=filename,
+        collection_meta_path=meta_file,
         major_release=major_release,
         all_collections=all_collections,
     )
     assert errors == [
-        error.replace("{filename}", str(filename)) for error in expected_errors
+        error.replace("{filename}", str(meta_file)) for error in expected_errors
     ]
 
 
+def test_lint_collection_meta_forbid_extras_once(tmp_path: Path):
+    filename = tmp_path / "collection-meta.yaml"
+    filename.write_text("collections: {}\n")
+    lint_collection_meta(
+        collection_meta_path=filename, major_release=5, all_collections=[]
+    )
+    with mock.patch(
+        "antsibull_core.collection_meta.forbid_extras", wraps=forbid_extras
+    ) as mock_forbid_extras:
+        for _ in range(3):
+            errors = lint_collection_meta(
+                collection_meta_path=filename, major_release=5, all_collections=[]
+            )
+            assert errors == []
+    mock_forbid_extras.assert_not_called()
+
+
+@pytest.mark.parametrize("extra", ["allow", "ignore"])
+def test_lint_collection_meta_after_set_extras(extra, tmp_path: Path):
+    filename = tmp_path / "collection-meta.yaml"
+    filename.write_text("collections: {}\nfoo: bar\n")
+    lint_collection_meta(
+        collection_meta_path=filename, major_release=5, all_collections=[]
+    )
+    set_extras(CollectionsMetadata, extra)
+    try:
+        errors = lint_collection_meta(
+            collection_meta_path=filename, major_release=5, all_collections=[]
+        )
+        assert errors == ["foo: Extra inputs are not permitted"]
+    finally:
+        set_extras(CollectionsMetadata, "forbid")
+
+
 def test_lint_collection_meta_not_existing(tmp_path: Path):
     filename = tmp_path / "collection-meta.yaml"
     errors = lint_collection_meta(
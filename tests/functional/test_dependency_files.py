@@ -38,10 +38,9 @@ SIMPLE_TEST_DEPS_2 = {
         ("6.0.0", "2.13.0rc1", SIMPLE_TEST_DEPS_2, SIMPLE_TEST_FILE_2),
     ),
 )
-def test_build_file_write(tmpdir, ansible_ver, core_ver, dependencies, file_contents):
-    filename = tmpdir / "test.build"
+def test_build_file_write(tmp_path, ansible_ver, core_ver, dependencies, file_contents):
+    filename = tmp_path / "test.build"
     bf = BuildFile(filename)
     bf.write(PypiVer(ansible_ver), core_ver, dependencies)
 
-    with open(filename) as f:
-        assert f.read() == file_contents
+    assert filename.read_text(encoding="utf-8") == file_contents
@@ -3,8 +3,11 @@
 # SPDX-FileCopyrightText: Ansible Project
 
 import hashlib
+import os
 
 import aiohttp
+import aiohttp.test_utils
+import aiohttp.web
 import pytest
 
 from antsibull_core.galaxy import (
@@ -13,121 +16,124 @@ from antsibull_core.galaxy import (
     GalaxyContext,
     GalaxyVersion,
 )
+from antsibull_core.utils.hashing import verify_hash
 
-KNOWN_CG_VERSIONS = [
-    "6.4.0",
-    "6.3.0",
-    "6.2.0",
-    "6.1.0",
-    "6.0.1",
-    "6.0.0",
-    "6.0.0-a1",
-    "5.8.6",
-    "5.8.5",
-    "5.8.4",
-    "5.8.3",
-    "5.8.2",
-    "5.8.1",
-    "5.8.0",
-    "5.7.0",
-    "5.6.0",
-    "5.5.0",
-    "5.4.0",
-    "5.3.0",
-    "5.2.0",
-    "5.1.1",
-    "5.1.0",
-    "5.0.2",
-    "5.0.1",
-    "5.0.0",
-    "5.0.0-a1",
-    "4.8.9",
-    "4.8.8",
-    "4.8.7",
-    "4.8.6",
-    "4.8.5",
-    "4.8.4",
-    "4.8.3",
-    "4.8.2",
-    "4.8.1",
-    "4.8.0",
-    "4.7.0",
-    "4.6.1",
-    "4.6.0",
-    "4.5.0",
-    "4.4.0",
-    "4.3.0",
-    "4.2.0",
-    "4.1.0",
-    "4.0.2",
-    "4.0.1",
-    "4.0.0",
-    "3.8.10",
-    "3.8.9",
-    "3.8.8",
-    "3.8.7",
-    "3.8.6",
-    "3.8.5",
-    "3.8.4",
-    "3.8.3",
-    "3.8.2",
-    "3.8.1",
-    "3.8.0",
-    "3.7.0",
-    "3.6.0",
-    "3.5.0",
-    "3.4.0",
-    "3.3.2",
-    "3.3.1",
-    "3.3.0",
-    "3.2.0",
-    "3.1.0",
-    "3.0.2",
-    "3.0.1",
-    "3.0.0",
-    "2.5.9",
-    "2.5.8",
-    "2.5.7",
-    "2.5.6",
-    "2.5.5",
-    "2.5.4",
-    "2.5.3",
-    "2.5.2",
-    "2.5.1",
-    "2.5.0",
-    "2.4.0",
-    "2.3.0",
-    "2.2.0",
-    "2.1.1",
-    "2.1.0",
-    "2.0.1",
-    "2.0.0",
-    "1.3.14",
-    "1.3.13",
-    "1.3.12",
-    "1.3.11",
-    "1.3.10",
-    "1.3.9",
-    "1.3.8",
-    "1.3.7",
-    "1.3.6",
-    "1.3.5",
-    "1.3.4",
-    "1.3.3",
-    "1.3.2",
-    "1.3.1",
-    "1.3.0",
-    "1.2.0",
-    "1.1.0",
-    "1.0.0",
-    "0.3.0-experimental.meta.redirects-3",
-    "0.3.0-experimental.meta.redirects-2",
-    "0.3.0-experimental.meta.redirects",
-    "0.2.1",
-    "0.2.0",
-    "0.1.4",
-    "0.1.1",
-]
+KNOWN_CG_VERSIONS = frozenset(
+    [
+        "6.4.0",
+        "6.3.0",
+        "6.2.0",
+        "6.1.0",
+        "6.0.1",
+        "6.0.0",
+        "6.0.0-a1",
+        "5.8.6",
+        "5.8.5",
+        "5.8.4",
+        "5.8.3",
+        "5.8.2",
+        "5.8.1",
+        "5.8.0",
+        "5.7.0",
+        "5.6.0",
+        "5.5.0",
+        "5.4.0",
+        "5.3.0",
+        "5.2.0",
+        "5.1.1",
+        "5.1.0",
+        "5.0.2",
+        "5.0.1",
+        "5.0.0",
+        "5.0.0-a1",
+        "4.8.9",
+        "4.8.8",
+        "4.8.7",
+        "4.8.6",
+        "4.8.5",
+        "4.8.4",
+        "4.8.3",
+        "4.8.2",
+        "4.8.1",
+        "4.8.0",
+        "4.7.0",
+        "4.6.1",
+        "4.6.0",
+        "4.5.0",
+        "4.4.0",
+        "4.3.0",
+        "4.2.0",
+        "4.1.0",
+        "4.0.2",
+        "4.0.1",
+        "4.0.0",
+        "3.8.10",
+        "3.8.9",
+        "3.8.8",
+        "3.8.7",
+        "3.8.6",
+        "3.8.5",
+        "3.8.4",
+        "3.8.3",
+        "3.8.2",
+        "3.8.1",
+        "3.8.0",
+        "3.7.0",
+        "3.6.0",
+        "3.5.0",
+        "3.4.0",
+        "3.3.2",
+        "3.3.1",
+        "3.3.0",
+        "3.2.0",
+        "3.1.0",
+        "3.0.2",
+        "3.0.1",
+        "3.0.0",
+        "2.5.9",
+        "2.5.8",
+        "2.5.7",
+        "2.5.6",
+        "2.5.5",
+        "2.5.4",
+        "2.5.3",
+        "2.5.2",
+        "2.5.1",
+        "2.5.0",
+        "2.4.0",
+        "2.3.0",
+        "2.2.0",
+        "2.1.1",
+        "2.1.0",
+        "2.0.1",
+        "2.0.0",
+        "1.3.14",
+        "1.3.13",
+        "1.3.12",
+        "1.3.11",
+        "1.3.10",
+        "1.3.9",
+        "1.3.8",
+        "1.3.7",
+        "1.3.6",
+        "1.3.5",
+        "1.3.4",
+        "1.3.3",
+        "1.3.2",
+        "1.3.1",
+        "1.3.0",
+        "1.2.0",
+        "1.1.0",
+        "1.0.0",
+        "0.3.0-experimental.meta.redirects-3",
+        "0.3.0-experimental.meta.redirects-2",
+        "0.3.0-experimental.meta.redirects",
+        "0.2.1",
+        "0.2.0",
+        "0.1.4",
+        "0.1.1",
+    ]
+)
 
 
 async def galaxy_client_test(
@@ -163,8 +169,9 @@ async def galaxy_client_test(
     if not skip_versions_test:
         cg_versions = await client.get_versions("community.general")
         print(cg_versions)
+        cg_versions_set = frozenset(cg_versions)
         for known_version in KNOWN_CG_VERSIONS:
-            assert known_version in cg_versions
+            assert known_version in cg_versions_set
 
     # Download collection
     if not skip_download_test:
@@ -177,25 +184,19 @@ async def galaxy_client_test(
             context=context,
         )
         path = await downloader.download("community.dns", "0.1.0")
-        with open(path, "rb") as f:
-            data = f.read()
-        length = len(data)
+        length = os.path.getsize(path)
         print(length)
         assert length == 133242
-        m = hashlib.sha256()
-        m.update(data)
-        digest = m.hexdigest()
         expected = "2de9d40940536e65b35995a3f58dea7776de3f23f1a7ab865e0b3b8482d746b5"
-        assert digest == expected
+        assert await verify_hash(path, expected)
 
         # Try again, should hit cache
         path2 = await downloader.download("community.dns", "0.1.0")
-        with open(path2, "rb") as f:
-            data2 = f.read()
         assert path == path2
-        assert data == data2
+        assert await verify_hash(path2, expected)
 
 
+@pytest.mark.network
 @pytest.mark.asyncio
 async def test_galaxy_v2(tmp_path_factory):
     galaxy_url = "https://old-galaxy.ansible.com"
@@ -206,6 +207,7 @@ async def test_galaxy_v2(tmp_path_factory):
         await galaxy_client_test(aio_session, context, tmp_path_factory)
 
 
+@pytest.mark.network
 @pytest.mark.asyncio
 async def test_galaxy_v3(tmp_path_factory):
     galaxy_url = "https://galaxy.ansible.com"
@@ -214,3 +216,129 @@ async def test_galaxy_v3(tmp_path_factory):
         assert context.version == GalaxyVersion.V3
         assert context.base_url == galaxy_url + "/api/v3/"
         await galaxy_client_test(aio_session, context, tmp_path_factory)
+
+
+def create_fake_galaxy(
+    api_version: str, artifact: bytes, requests: list[str]
+) -> aiohttp.web.Application:
+    """
+    Create an application that serves community.dns 0.1.0 from a minimal Galaxy API.
+    """
+    versions = [f"0.{minor}.0" for minor in range(3)]
+
+    async def handle(request: aiohttp.web.Request) -> aiohttp.web.StreamResponse:
+        requests.append(request.path)
+        base = f"/api/{api_version}/collections/community/dns/"
+        path = request.path
+        if path == "/api/":
+            return aiohttp.web.json_response(
+                {"available_versions": {api_version: f"{api_version}/"}}
+            )
+        if path == base:
+            return aiohttp.web.json_response(
+                {"name": "dns", "deprecated": False, "namespace": {"name": "community"}}
+            )
+        if path == f"{base}versions/":
+            # Return one version per page to exercise pagination
+            page = int(request.query.get("page", "0"))
+            results = [{"version": versions[page]}]
+            next_link = None
+            if page + 1 < len(versions):
+                next_url = request.url.with_query(page=page + 1)
+                # Galaxy v2 returns absolute links, Galaxy v3 relative ones
+                next_link = str(
+                    next_url if api_version == "v2" else next_url.relative()
+                )
+            if api_version == "v2":
+                return aiohttp.web.json_response(
+                    {"results": results, "next": next_link}
+                )
+            return aiohttp.web.json_response(
+                {"data": results, "links": {"next": next_link}}
+            )
+        if path == f"{base}versions/0.1.0/":
+            return aiohttp.web.json_response(
+                {
+                    "download_url": str(
+                        request.url.with_path("/download/community-dns-0.1.0.tar.gz")
+                    ),
+                    "artifact": {
+                        "filename": "community-dns-0.1.0.tar.gz",
+                        "size": len(artifact),
+                        "sha256": hashlib.sha256(artifact).hexdigest(),
+                    },
+                    "version": "0.1.0",
+                }
+            )
+        if path == "/download/community-dns-0.1.0.tar.gz":
+            return aiohttp.web.Response(body=artifact)
+        raise aiohttp.web.HTTPNotFound()
+
+    app = aiohttp.web.Application()
+    app.router.add_route("GET", "/{tail:.*}", handle)
+    return app
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "api_version, galaxy_version",
+    [("v2", GalaxyVersion.V2), ("v3", GalaxyVersion.V3)],
+)
+async def test_galaxy_offline(api_version, galaxy_version, tmp_path):
+    artifact = os.urandom(1000)
+    requests: list[str] = []
+    app = create_fake_galaxy(api_version, artifact, requests)
+    async with aiohttp.test_utils.TestServer(app) as server:
+        galaxy_url = str(server.make_url("/"))
+        async with aiohttp.ClientSession() as aio_session:
+            context = await GalaxyContext.create(aio_session, galaxy_url)
+            assert context.version == galaxy_version
+            assert context.base_url == f"{galaxy_url}api/{api_version}/"
+
+            client = GalaxyClient(aio_session, context=context)
+            info = await client.get_info("community.dns")
+            assert info["name"] == "dns"
+            assert await client.get_versions("community.dns") == [
+                "0.0.0",
+                "0.1.0",
+                "0.2.0",
+            ]
+
+            os.mkdir(tmp_path / "download")
+            os.mkdir(tmp_path / "cache")
+            downloader = CollectionDownloader(
+                aio_session,
+                str(tmp_path / "download"),
+                collection_cache=str(tmp_path / "cache"),
+                context=context,
+            )
+            path = await downloader.download("community.dns", "0.1.0")
+            with open(path, "rb") as f:
+                assert f.read() == artifact
+
+            # Try again, should hit cache
+            requests.clear()
+            assert await downloader.download("community.dns", "0.1.0") == path
+            assert "/download/community-dns-0.1.0.tar.gz" not in requests
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("trust_collection_cache", [False, True])
+async def test_galaxy_offline_cache_is_download_dir(trust_collection_cache, tmp_path):
+    artifact = os.urandom(1000)
+    app = create_fake_galaxy("v3", artifact, [])
+    async with aiohttp.test_utils.TestServer(app) as server:
+        async with aiohttp.ClientSession() as aio_session:
+            context = await GalaxyContext.create(aio_session, str(server.make_url("/")))
+            downloader = CollectionDownloader(
+                aio_session,
+                str(tmp_path),
+                collection_cache=str(tmp_path),
+                trust_collection_cache=trust_collection_cache,
+                context=context,
+            )
+            path = await downloader.download("community.dns", "0.1.0")
+            # Copying the cached artifact onto itself must not truncate it
+            assert await downloader.download("community.dns", "0.1.0") == path
+            with open(path, "rb") as f:
+                assert f.read() == artifact
@@ -2,8 +2,6 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # SPDX-FileCopyrightText: Ansible Project
 
-import os
-
 import pytest
 import twiggy.levels
 
@@ -20,28 +18,38 @@ def test_library_settings(capsys):
     assert captured.out == ""
 
 
-def test_initialize_app_logging(capsys):
-    """Calling initialize_app_logging outputs WARNING and above to stderr."""
-    al.initialize_app_logging()
-
-    al.log.error("test")
-    al.log.warning("second test")
-    al.log.debug("third test")
-    captured = capsys.readouterr()
-    assert captured.err == "ERROR:antsibull|test\nWARNING:antsibull|second test\n"
-    assert captured.out == ""
-
-
-def test_initialize_app_logging_debug(capsys):
-    os.environ["ANTSIBULL_EARLY_DEBUG"] = "1"
+@pytest.mark.parametrize(
+    "early_debug, expected_err",
+    [
+        pytest.param(
+            None,
+            "ERROR:antsibull|test\nWARNING:antsibull|second test\n",
+            id="warn",
+        ),
+        pytest.param(
+            "1",
+            "ERROR:antsibull|test\nWARNING:antsibull|second test\n"
+            "DEBUG:antsibull|third test\n",
+            id="debug",
+        ),
+    ],
+)
+def test_initialize_app_logging(capsys, monkeypatch, early_debug, expected_err):
+    """
+    Calling initialize_app_logging outputs WARNING and above to stderr,
+    or everything if ANTSIBULL_EARLY_DEBUG is set.
+    """
+    if early_debug is None:
+        monkeypatch.delenv("ANTSIBULL_EARLY_DEBUG", raising=False)
+    else:
+        monkeypatch.setenv("ANTSIBULL_EARLY_DEBUG", early_debug)
     al.initialize_app_logging()
+    # Only look at the output of the following log calls
+    capsys.readouterr()
 
     al.log.error("test")
     al.log.warning("second test")
     al.log.debug("third test")
     captured = capsys.readouterr()
-    assert (
-        captured.err
-        == "ERROR:antsibull|test\nWARNING:antsibull|second test\nDEBUG:antsibull|third test\n"
-    )
+    assert captured.err == expected_err
     assert captured.out == ""
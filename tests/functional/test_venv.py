@@ -3,30 +3,245 @@
 # GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
 # https://www.gnu.org/licenses/gpl-3.0.txt)
 
+import asyncio
 import os.path
+import re
+import subprocess
 import sys
+import threading
 from unittest import mock
 
 import pytest
+from packaging.version import Version as PypiVer
 
 from antsibull_core import subprocess_util
+from antsibull_core import venv as venv_module
 from antsibull_core.venv import FakeVenvRunner, VenvRunner, get_clean_environment
 
 
+@pytest.fixture
+def fast_venv(monkeypatch):
+    """
+    Make VenvRunner only create an empty bin/pip instead of a real venv.
+    """
+
+    def create(env_dir, **kwargs):
+        os.makedirs(os.path.join(env_dir, "bin"))
+        with open(os.path.join(env_dir, "bin", "pip"), "w"):
+            pass
+
+    monkeypatch.setattr(venv_module.venv, "create", create)
+    monkeypatch.setattr(
+        venv_module, "_get_pip_version", lambda venv_dir: venv_module._MIN_PIP
+    )
+
+
 def test_venv_clean_env(monkeypatch):
     monkeypatch.setenv("PYTHONPATH", "/jfjfjfjfjfjfjfjfj")
     assert "PYTHONPATH" not in get_clean_environment()
 
 
-def test_venv_run_init(tmp_path):
-    with mock.patch("antsibull_core.subprocess_util.async_log_run") as log_run:
+@pytest.mark.slow
+def test_venv_run_init(tmp_path, monkeypatch):
+    monkeypatch.setenv("ANTSIBULL_FORCE_PIP_UPGRADE", "1")
+    with mock.patch("antsibull_core.venv._sync_run") as sync_run:
         runner = VenvRunner("asdfgh", tmp_path)
         assert runner.name == "asdfgh"
         assert runner.top_dir == tmp_path
         assert runner.venv_dir == str(tmp_path / "asdfgh")
         pip = os.path.join(runner.venv_dir, "bin", "pip")
-        log_run.assert_called_once_with(
+        sync_run.assert_called_once_with(
             [pip, "install", "--upgrade", "pip"],
+            env=get_clean_environment(),
+        )
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize(
+    "pip_version, upgraded",
+    [
+        ("19.2.3", True),
+        ("19.3", False),
+        ("24.0", False),
+        (None, True),
+    ],
+)
+def test_venv_run_init_pip_version(tmp_path, monkeypatch, pip_version, upgraded):
+    monkeypatch.delenv("ANTSIBULL_FORCE_PIP_UPGRADE", raising=False)
+    version = None if pip_version is None else PypiVer(pip_version)
+    with mock.patch("antsibull_core.venv._sync_run") as sync_run:
+        with mock.patch("antsibull_core.venv._get_pip_version", return_value=version):
+            VenvRunner("asdfgh", tmp_path)
+    assert sync_run.called == upgraded
+
+
+@pytest.mark.slow
+def test_venv_get_pip_version(tmp_path):
+    runner = FakeVenvRunner()
+    runner.log_run(["python", "-m", "venv", "--without-pip", str(tmp_path / "a")])
+    assert venv_module._get_pip_version(str(tmp_path / "a")) is None
+
+    with mock.patch("antsibull_core.venv._sync_run"):
+        runner = VenvRunner("b", tmp_path)
+    assert venv_module._get_pip_version(runner.venv_dir) >= venv_module._MIN_PIP
+
+
+@pytest.mark.slow
+def test_venv_recreate(tmp_path):
+    threads = set(threading.enumerate())
+    with mock.patch("antsibull_core.venv._sync_run"):
+        runner = VenvRunner("asdfgh", tmp_path)
+        marker = os.path.join(runner.venv_dir, "marker")
+        with open(marker, "w") as f:
+            f.write("old venv")
+        runner = VenvRunner("asdfgh", tmp_path)
+    assert not os.path.exists(marker)
+    assert os.path.exists(os.path.join(runner.venv_dir, "bin", "python"))
+
+    # The old venv is deleted in a background thread
+    for thread in set(threading.enumerate()) - threads:
+        thread.join(timeout=30)
+    assert sorted(os.listdir(tmp_path)) == ["asdfgh"]
+
+
+def test_venv_recreate_not_a_directory(tmp_path, fast_venv):
+    path = tmp_path / "asdfgh"
+    path.write_text("not a venv")
+    with pytest.raises(NotADirectoryError):
+        VenvRunner("asdfgh", tmp_path)
+    assert path.read_text() == "not a venv"
+
+
+def test_venv_sync_run():
+    venv_module._sync_run([sys.executable, "-c", "pass"], env=get_clean_environment())
+    with pytest.raises(subprocess.CalledProcessError):
+        venv_module._sync_run(
+            [sys.executable, "-c", "raise SystemExit(3)"], env=get_clean_environment()
+        )
+
+
+@pytest.mark.slow
+def test_venv_template_cache(tmp_path):
+    cache = tmp_path / "cache"
+    with mock.patch(
+        "antsibull_core.venv._get_pip_version", return_value=venv_module._MIN_PIP
+    ) as mock_get_pip_version:
+        runner = VenvRunner("first", tmp_path, template_cache=str(cache))
+        runner2 = VenvRunner("second", tmp_path, template_cache=str(cache))
+        # pip is only checked while creating the template
+        mock_get_pip_version.assert_called_once()
+
+    (template,) = cache.iterdir()
+    for r in (runner, runner2):
+        python = os.path.join(r.venv_dir, "bin", "python")
+        with open(os.path.join(r.venv_dir, "bin", "activate")) as f:
+            activate = f.read()
+        assert r.venv_dir in activate
+        assert str(template) not in activate
+        with open(os.path.join(r.venv_dir, "bin", "pip")) as f:
+            assert f.readline() == f"#!{python}\n"
+        proc = subprocess.run(
+            [python, "-c", "import sys; print(sys.prefix)"],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        assert proc.stdout == f"{r.venv_dir}\n"
+
+
+def test_venv_install_packages(tmp_path, fast_venv):
+    with mock.patch("antsibull_core.subprocess_util.async_log_run") as log_run:
+        runner = VenvRunner("asdfgh", tmp_path)
+        pip = os.path.join(runner.venv_dir, "bin", "pip")
+
+        runner.install_packages(["foo", "bar>=1.0"])
+        log_run.assert_called_once_with(
+            [pip, "install", "foo", "bar>=1.0"],
+            None,
+            None,
+            mock.ANY,
+            True,
+            errors="strict",
+            env=get_clean_environment(),
+        )
+        # pip's stderr is logged in batches of lines
+        assert isinstance(log_run.call_args.args[3], subprocess_util.BatchedLogCallback)
+
+        log_run.reset_mock()
+        runner.install_package("baz")
+        log_run.assert_called_once_with(
+            [pip, "install", "baz"],
+            None,
+            None,
+            mock.ANY,
+            True,
+            errors="strict",
+            env=get_clean_environment(),
+        )
+        assert isinstance(log_run.call_args.args[3], subprocess_util.BatchedLogCallback)
+
+
+def test_venv_install_packages_batched_stderr(tmp_path, fast_venv):
+    runner = VenvRunner("asdfgh", tmp_path)
+    pip = os.path.join(runner.venv_dir, "bin", "pip")
+    with open(pip, "w") as f:
+        f.write('#!/bin/sh\nfor i in $(seq 100); do echo "line $i" >&2; done\n')
+    os.chmod(pip, 0o755)
+
+    with mock.patch("antsibull_core.subprocess_util.mlog") as mlog:
+        runner.install_packages(["foo"])
+    stderr_calls = [
+        call.args[0]
+        for call in mlog.debug.call_args_list
+        if call.args[0].startswith("stderr: ")
+    ]
+    assert stderr_calls == [
+        "\n".join(f"stderr: line {i}" for i in range(1, 65)),
+        "\n".join(f"stderr: line {i}" for i in range(65, 101)),
+    ]
+
+
+def test_venv_install_packages_empty(tmp_path, fast_venv):
+    with mock.patch("antsibull_core.subprocess_util.async_log_run") as log_run:
+        runner = VenvRunner("asdfgh", tmp_path)
+        with pytest.raises(ValueError, match="^No packages to install were given$"):
+            runner.install_packages([])
+    log_run.assert_not_called()
+
+
+def test_venv_install_packages_parallel(tmp_path, fast_venv):
+    with mock.patch("antsibull_core.subprocess_util.async_log_run") as log_run:
+        runner = VenvRunner("asdfgh", tmp_path)
+        pip = os.path.join(runner.venv_dir, "bin", "pip")
+
+        results = asyncio.run(
+            runner.async_install_packages_parallel(["foo", "bar", "baz"], concurrency=2)
+        )
+        assert len(results) == 3
+        assert sorted(call.args[0] for call in log_run.call_args_list) == [
+            [pip, "install", "bar"],
+            [pip, "install", "baz"],
+            [pip, "install", "foo"],
+        ]
+        # Every pip run needs its own callback, since it collects lines
+        callbacks = [call.args[3] for call in log_run.call_args_list]
+        assert all(
+            isinstance(callback, subprocess_util.BatchedLogCallback)
+            for callback in callbacks
+        )
+        assert len(set(map(id, callbacks))) == 3
+
+
+def test_venv_log_run_new_executable(tmp_path, fast_venv):
+    with mock.patch("antsibull_core.subprocess_util.async_log_run") as log_run:
+        runner = VenvRunner("asdfgh", tmp_path)
+        foo = os.path.join(runner.venv_dir, "bin", "foo")
+        with open(foo, "w") as f:
+            f.write("#!/bin/sh\n")
+
+        runner.log_run(["foo", "bar"])
+        log_run.assert_called_once_with(
+            [foo, "bar"],
             None,
             None,
             "debug",
@@ -36,17 +251,19 @@ def test_venv_run_init(tmp_path):
         )
 
 
-def test_venv_log_run_error(tmp_path):
+def test_venv_log_run_error(tmp_path, fast_venv):
     runner = VenvRunner("zxcvb", tmp_path)
     echo = os.path.join(runner.venv_dir, "bin", "echo")
-    with pytest.raises(ValueError, match=rf"^{echo!r} does not exist!"):
+    with pytest.raises(ValueError, match=rf"^{re.escape(repr(echo))} does not exist!"):
         runner.log_run(["echo", "This won't work!"])
 
 
-def test_venv_log_run_error2(tmp_path):
+def test_venv_log_run_error2(tmp_path, fast_venv):
     runner = VenvRunner("zxcvb", tmp_path)
     echo = "/usr/bin/echo"
-    with pytest.raises(ValueError, match=rf"^{echo!r} must not be an absolute path!"):
+    with pytest.raises(
+        ValueError, match=rf"^{re.escape(repr(echo))} must not be an absolute path!"
+    ):
         runner.log_run([echo, "This also won't work!"])
 
 
@@ -68,3 +285,30 @@ def test_fake_venv_python():
             True,
             errors="strict",
         )
+
+
+def test_fake_venv_reuses_loop():
+    runner = FakeVenvRunner()
+    runner.log_run(["python", "-c", "pass"])
+    loop = venv_module._get_runner_loop()
+    runner.log_run(["python", "-c", "pass"])
+    assert venv_module._get_runner_loop() is loop
+    assert not loop.is_closed()
+
+
+def test_runner_loop_closed_with_thread():
+    loops = []
+    thread = threading.Thread(
+        target=lambda: loops.append(venv_module._get_runner_loop())
+    )
+    thread.start()
+    thread.join()
+    # The loop is closed once the thread that used it has finished
+    assert loops[0].is_closed()
+    assert venv_module._get_runner_loop() is not loops[0]
+
+
+def test_runner_loop_closed_at_exit():
+    loop = venv_module._get_runner_loop()
+    venv_module._close_runner_loop()
+    assert loop.is_closed()
@@ -11,9 +11,9 @@ import antsibull_core.ansible_core as ac
 @pytest.mark.parametrize(
     "version, is_devel",
     [
-        ("2.14.0dev0", True),
-        ("2.14.0", False),
+        pytest.param(Version("2.14.0dev0"), True, id="2.14.0dev0"),
+        pytest.param(Version("2.14.0"), False, id="2.14.0"),
     ],
 )
 def test_get_core_package_name_returns_ansible_core(version, is_devel):
-    assert ac._version_is_devel(Version(version)) == is_devel
+    assert ac._version_is_devel(version) == is_devel
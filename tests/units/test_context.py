@@ -4,12 +4,15 @@
 
 import argparse
 
-from pydantic import HttpUrl
+import pytest
 
 import antsibull_core.app_context as ap
 from antsibull_core.schemas.config import LoggingModel
 from antsibull_core.utils.collections import ContextDict
 
+# ContextDict is immutable, so the expected values can be shared between tests
+EMPTY_CONTEXT_DICT = ContextDict()
+
 #
 # Context creation tests
 #
@@ -24,91 +27,81 @@ def test_default():
     assert lib_ctx.max_retries == 10
 
     app_ctx = ap.app_ctx.get()
-    assert app_ctx.extra == ContextDict()
-    assert isinstance(app_ctx.logging_cfg, LoggingModel)
-
-
-def test_create_contexts_with_cfg():
-    """Test that the create_contexts function sets values from a config dict"""
-    cfg = {"chunksize": 1, "unknown": True}
-    app_ctx, lib_ctx, args, cfg = ap.create_contexts(cfg=cfg)
-
-    assert args == argparse.Namespace()
-    assert cfg == {}
-
-    assert lib_ctx.chunksize == 1
-    assert lib_ctx.process_max is None
-    assert lib_ctx.thread_max == 8
-    assert lib_ctx.max_retries == 10
-
-    assert app_ctx.extra == ContextDict({"unknown": True})
-    assert isinstance(app_ctx.logging_cfg, LoggingModel)
-
-
-def test_create_contexts_with_args():
-    """Test that the create_context function sets values from cli args"""
-    args = {"process_max": 2, "unknown": True}
-    args = argparse.Namespace(**args)
-    app_ctx, lib_ctx, args, cfg = ap.create_contexts(args=args)
-
-    assert args == argparse.Namespace()
-    assert cfg == {}
-
-    assert lib_ctx.chunksize == 4096
-    assert lib_ctx.process_max == 2
-    assert lib_ctx.thread_max == 8
-    assert lib_ctx.max_retries == 10
-
-    assert app_ctx.extra == ContextDict({"unknown": True})
-    assert isinstance(app_ctx.logging_cfg, LoggingModel)
-
-
-def test_create_contexts_with_args_and_cfg():
-    """Test that args override cfg"""
-    cfg = {
-        "chunksize": 1,
-        "thread_max": 2,
-        "unknown": True,
-        "cfg": 1,
-    }
-    args = {
-        "chunksize": 3,
-        "unknown": False,
-        "args": 2,
-    }
-    args = argparse.Namespace(**args)
-    app_ctx, lib_ctx, args, cfg = ap.create_contexts(args=args, cfg=cfg)
-
-    assert args == argparse.Namespace()
-    assert cfg == {}
-
-    assert lib_ctx.chunksize == 3
-    assert lib_ctx.process_max is None
-    assert lib_ctx.thread_max == 2
-    assert lib_ctx.max_retries == 10
-
-    assert app_ctx.extra == ContextDict({"unknown": False, "cfg": 1, "args": 2})
+    assert app_ctx.extra == EMPTY_CONTEXT_DICT
     assert isinstance(app_ctx.logging_cfg, LoggingModel)
 
 
-def test_create_contexts_without_extra():
-    """Test that use_extra=False returns unused args and cfg."""
-    cfg_data = {"chunksize": 7, "unknown": True, "cfg": 1}
-    args_data = {"thread_max": 10, "unknown": False, "args": 2}
-    input_args = argparse.Namespace(**args_data)
+@pytest.mark.parametrize(
+    "args, cfg, use_extra, expected_args, expected_cfg, expected_lib, expected_extra",
+    [
+        pytest.param(
+            None,
+            {"chunksize": 1, "unknown": True},
+            True,
+            {},
+            {},
+            {"chunksize": 1},
+            ContextDict({"unknown": True}),
+            id="cfg",
+        ),
+        pytest.param(
+            {"process_max": 2, "unknown": True},
+            {},
+            True,
+            {},
+            {},
+            {"process_max": 2},
+            ContextDict({"unknown": True}),
+            id="args",
+        ),
+        # args override cfg
+        pytest.param(
+            {"chunksize": 3, "unknown": False, "args": 2},
+            {"chunksize": 1, "thread_max": 2, "unknown": True, "cfg": 1},
+            True,
+            {},
+            {},
+            {"chunksize": 3, "thread_max": 2},
+            ContextDict({"unknown": False, "cfg": 1, "args": 2}),
+            id="args-and-cfg",
+        ),
+        # use_extra=False returns unused args and cfg
+        pytest.param(
+            {"thread_max": 10, "unknown": False, "args": 2},
+            {"chunksize": 7, "unknown": True, "cfg": 1},
+            False,
+            {"unknown": False, "args": 2},
+            {"unknown": True, "cfg": 1},
+            {"chunksize": 7, "thread_max": 10},
+            EMPTY_CONTEXT_DICT,
+            id="without-extra",
+        ),
+    ],
+)
+def test_create_contexts(
+    args, cfg, use_extra, expected_args, expected_cfg, expected_lib, expected_extra
+):
+    """Test that the create_contexts function sets values from cli args and a config dict"""
+    if args is not None:
+        args = argparse.Namespace(**args)
     app_ctx, lib_ctx, args, cfg = ap.create_contexts(
-        args=input_args, cfg=cfg_data, use_extra=False
+        args=args, cfg=cfg, use_extra=use_extra
     )
 
-    assert args == argparse.Namespace(unknown=False, args=2)
-    assert cfg == {"unknown": True, "cfg": 1}
+    assert args == argparse.Namespace(**expected_args)
+    assert cfg == expected_cfg
 
-    assert lib_ctx.chunksize == 7
-    assert lib_ctx.process_max is None
-    assert lib_ctx.thread_max == 10
-    assert lib_ctx.max_retries == 10
+    expected_lib = {
+        "chunksize": 4096,
+        "process_max": None,
+        "thread_max": 8,
+        "max_retries": 10,
+        **expected_lib,
+    }
+    for name, value in expected_lib.items():
+        assert getattr(lib_ctx, name) == value
 
-    assert app_ctx.extra == ContextDict()
+    assert app_ctx.extra == expected_extra
     assert isinstance(app_ctx.logging_cfg, LoggingModel)
 
 
@@ -138,7 +131,7 @@ def test_context_overrides():
 
     # Check that once we return from the context managers, the old values have been restored
     app_ctx = ap.app_ctx.get()
-    assert app_ctx.extra == ContextDict()
+    assert app_ctx.extra == EMPTY_CONTEXT_DICT
     assert isinstance(app_ctx.logging_cfg, LoggingModel)
 
     lib_ctx = ap.lib_ctx.get()
@@ -198,7 +191,7 @@ def test_app_and_lib_context():
 
     # Check that once we return from the context manager, the old values have been restored
     app_ctx = ap.app_ctx.get()
-    assert app_ctx.extra == ContextDict()
+    assert app_ctx.extra == EMPTY_CONTEXT_DICT
     assert isinstance(app_ctx.logging_cfg, LoggingModel)
 
     lib_ctx = ap.lib_ctx.get()
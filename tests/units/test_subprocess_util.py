@@ -3,20 +3,23 @@
 # GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
 # https://www.gnu.org/licenses/gpl-3.0.txt)
 
+import asyncio
 import logging as stdlog
-from unittest.mock import MagicMock, call
+import os
+import warnings
+from unittest.mock import MagicMock, call, patch
 
 import pytest
 import twiggy
 
-import antsibull_core.subprocess_util
 from antsibull_core import logging
+from antsibull_core.subprocess_util import BatchedLogCallback, _stream_log, log_run
 
 
 def test_log_run() -> None:
     logger = MagicMock()
     args = ("bash", "-ec", "echo 123 && echo 456 >&2")
-    proc = antsibull_core.subprocess_util.log_run(args, logger)
+    proc = log_run(args, logger)
     assert proc.args == args
     assert proc.returncode == 0
     assert proc.stdout == "123\n"
@@ -34,27 +37,36 @@ def test_log_run_multi() -> None:
     done
     """
     args = ("bash", "-ec", command)
-    proc = antsibull_core.subprocess_util.log_run(args, logger, "info", "warn")
+    proc = log_run(args, logger, "info", "warn")
     assert proc.args == args
     assert proc.returncode == 0
 
     logger.debug.assert_called_once_with(f"Running subprocess: {args}")
-    assert logger.warn.call_count == 15
-    assert logger.info.call_count == 15
-    expected_out: list[str] = []
-    expected_err: list[str] = []
-    for index, inp in enumerate(logger.info.call_args_list):
-        msg = f"{index+1}: Hello, stdout"
-        expected_out.append(msg)
-        assert inp == call("stdout: " + msg)
-    for index, inp in enumerate(logger.warn.call_args_list):
-        msg = f"{index+1}: Hello, stderr"
-        expected_err.append(msg)
-        assert inp == call("stderr: " + msg)
+    expected_out = [f"{i}: Hello, stdout" for i in range(1, 16)]
+    expected_err = [f"{i}: Hello, stderr" for i in range(1, 16)]
+    assert logger.info.call_args_list == [call(f"stdout: {m}") for m in expected_out]
+    assert logger.warn.call_args_list == [call(f"stderr: {m}") for m in expected_err]
     assert proc.stdout == "\n".join(expected_out) + "\n"
     assert proc.stderr == "\n".join(expected_err) + "\n"
 
 
+@pytest.mark.slow
+def test_log_run_long_line() -> None:
+    count = 9 * 1024 * 1024
+    args = (
+        "sh",
+        "-c",
+        f"dd if=/dev/zero of=/dev/stdout bs={count} count=1 ; echo ; echo foo",
+    )
+    proc = log_run(args)
+    assert proc.args == args
+    assert proc.returncode == 0
+    # Check the output without building a second multi-megabyte string
+    assert len(proc.stdout) == count + len("\nfoo\n")
+    assert proc.stdout.endswith("\nfoo\n")
+    assert proc.stdout.count("\u0000") == count
+
+
 @pytest.mark.parametrize(
     "count",
     [
@@ -65,16 +77,21 @@ def test_log_run_multi() -> None:
         9 * 1024 * 1024,
     ],
 )
-def test_log_run_long_line(count: int) -> None:
-    args = (
-        "sh",
-        "-c",
-        f"dd if=/dev/zero of=/dev/stdout bs={count} count=1 ; echo ; echo foo",
-    )
-    proc = antsibull_core.subprocess_util.log_run(args)
-    assert proc.args == args
-    assert proc.returncode == 0
-    assert proc.stdout == ("\u0000" * count) + "\nfoo\n"
+def test_stream_log_long_line(count: int) -> None:
+    # Feed the stream directly instead of spawning a process for every line length
+    async def stream_log() -> str:
+        stream = asyncio.StreamReader(limit=2**23)
+        stream.feed_data(b"\0" * count + b"\nfoo\n")
+        stream.feed_eof()
+        return await _stream_log("stdout: ", lines.append, stream, "strict")
+
+    lines: list[str] = []
+    output = asyncio.run(stream_log())
+    assert len(output) == count + len("\nfoo\n")
+    assert output.endswith("\nfoo\n")
+    assert output.count("\u0000") == count
+    assert len(lines) == 2
+    assert lines[1] == "stdout: foo"
 
 
 def test_log_run_callback() -> None:
@@ -84,7 +101,7 @@ def test_log_run_callback() -> None:
     async def add_to_stderr(string: str, /) -> None:
         stderr_lines.append(string)
 
-    antsibull_core.subprocess_util.log_run(
+    log_run(
         ["sh", "-c", "echo Never; echo gonna >&2; echo give"],
         None,
         stdout_lines.append,
@@ -99,9 +116,7 @@ def test_log_run_brackets_twiggy(capsys: pytest.CaptureFixture) -> None:
         logging.initialize_app_logging()
         msg = "{abc} {x} }{}"
         args = ("echo", msg)
-        antsibull_core.subprocess_util.log_run(
-            args, logger=logging.log, stdout_loglevel="error"
-        )
+        log_run(args, logger=logging.log, stdout_loglevel="error")
         _, stderr = capsys.readouterr()
         assert stderr == f"ERROR:antsibull|stdout: {msg}\n"
     finally:
@@ -119,6 +134,68 @@ def test_log_run_percent_logging(capsys: pytest.CaptureFixture) -> None:
 
     msg = "%s %(abc)s % %%"
     args = ("echo", msg)
-    antsibull_core.subprocess_util.log_run(args, logger=logger, stdout_loglevel="error")
+    log_run(args, logger=logger, stdout_loglevel="error")
     _, stderr = capsys.readouterr()
     assert stderr == f"ERROR:test_logger|stdout: {msg}\n"
+
+
+@pytest.mark.parametrize(
+    "lines, batch_size, expected",
+    [
+        (0, 2, []),
+        (1, 2, ["1"]),
+        (4, 2, ["1\n2", "3\n4"]),
+        (5, 2, ["1\n2", "3\n4", "5"]),
+        (3, 64, ["1\n2\n3"]),
+    ],
+)
+def test_log_run_batched_callback(lines: int, batch_size: int, expected: list[str]):
+    batches: list[str] = []
+    callback = BatchedLogCallback(batches.append, batch_size)
+    args = ("sh", "-c", f"seq 1 {lines} >&2" if lines else "true")
+    proc = log_run(args, None, None, callback)
+    assert batches == expected
+    assert proc.stderr == "".join(f"{i}\n" for i in range(1, lines + 1))
+
+
+def test_log_run_batched_loglevel() -> None:
+    logger = MagicMock()
+    callback = BatchedLogCallback.from_loglevel(
+        "warn", logger, batch_size=10, name="stderr"
+    )
+    args = ("sh", "-c", "seq 1 15 >&2")
+    log_run(args, logger, None, callback)
+    assert logger.warn.call_args_list == [
+        call("\n".join(f"stderr: {i}" for i in range(1, 11))),
+        call("\n".join(f"stderr: {i}" for i in range(11, 16))),
+    ]
+
+
+@pytest.mark.parametrize(
+    "kwargs, expected",
+    [
+        ({}, True),
+        ({"close_fds": False}, False),
+    ],
+)
+def test_log_run_close_fds(kwargs: dict, expected: bool) -> None:
+    with patch(
+        "asyncio.create_subprocess_exec", wraps=asyncio.create_subprocess_exec
+    ) as create_subprocess_exec:
+        log_run(["true"], **kwargs)
+    assert create_subprocess_exec.call_args.kwargs.get("close_fds", True) == expected
+
+
+def test_log_run_pass_fds() -> None:
+    read_fd, write_fd = os.pipe()
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            result = log_run(
+                ["bash", "-ec", f"echo 123 >&{write_fd}"], pass_fds=(write_fd,)
+            )
+        assert result.returncode == 0
+        assert os.read(read_fd, 100) == b"123\n"
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
@@ -0,0 +1,56 @@
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: Ansible Project
+
+import tarfile
+
+import pytest
+
+from antsibull_core.tarball import InvalidTarball, unpack_tarball
+
+
+def _create_tarball(path, mode, toplevel_dirs):
+    with tarfile.open(path, mode) as tar:
+        for toplevel_dir in toplevel_dirs:
+            info = tarfile.TarInfo(toplevel_dir)
+            info.type = tarfile.DIRTYPE
+            tar.addfile(info)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "suffix, mode",
+    [
+        (".tar.gz", "w:gz"),
+        (".tgz", "w:gz"),
+        (".tar.bz2", "w:bz2"),
+        (".tar.xz", "w:xz"),
+    ],
+)
+async def test_unpack_tarball(tmp_path, suffix, mode):
+    tarname = tmp_path / f"foo-1.0.0{suffix}"
+    _create_tarball(tarname, mode, ["foo-1.0.0"])
+    destdir = tmp_path / "dest"
+    destdir.mkdir()
+
+    assert await unpack_tarball(tarname, destdir) == "foo-1.0.0/"
+    assert (destdir / "foo-1.0.0").is_dir()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "name, toplevel_dirs, message",
+    [
+        ("foo-1.0.0.zip", ["foo-1.0.0"], "does not have a known suffix"),
+        ("foo-1.0.0.tar.gz", ["foo-1.0.0", "bar"], "more than a single toplevel dir"),
+        ("foo-1.0.0.tar.gz", ["bar"], "was not foo-1.0.0$"),
+    ],
+)
+async def test_unpack_tarball_fail(tmp_path, name, toplevel_dirs, message):
+    tarname = tmp_path / name
+    _create_tarball(tarname, "w:gz", toplevel_dirs)
+    destdir = tmp_path / "dest"
+    destdir.mkdir()
+
+    with pytest.raises(InvalidTarball, match=message):
+        await unpack_tarball(tarname, destdir)
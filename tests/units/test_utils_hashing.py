@@ -0,0 +1,129 @@
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: Ansible Project
+
+import pytest
+
+from antsibull_core.utils.hashing import verify_a_hash, verify_hash, verify_many
+
+HASH_TESTS = [
+    (
+        b"",
+        "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855",
+        "sha256",
+        {},
+        True,
+    ),
+    (
+        b"foo",
+        "2c26b46b68ffc68ff99b453c1d30413413422d706483bfa0f98a5e886266e7ae",
+        "sha256",
+        {},
+        True,
+    ),
+    (
+        b"bar",
+        "2c26b46b68ffc68ff99b453c1d30413413422d706483bfa0f98a5e886266e7ae",
+        "sha256",
+        {},
+        False,
+    ),
+    (
+        b"foo",
+        "b8fe9f7f6255a6fa08f668ab632a8d081ad87983c77cd274e48ce450f0b349fd",
+        "blake2b",
+        {"digest_size": 32},
+        True,
+    ),
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "content, hash, algorithm, algorithm_kwargs, expected_match", HASH_TESTS
+)
+async def test_verify_hash(
+    content: bytes,
+    hash: str,
+    algorithm: str,
+    algorithm_kwargs: dict,
+    expected_match: bool,
+    tmp_path,
+):
+    filename = tmp_path / "file"
+    filename.write_bytes(content)
+    result = await verify_hash(
+        filename, hash, algorithm=algorithm, algorithm_kwargs=algorithm_kwargs
+    )
+    assert result is expected_match
+
+
+HASH_DICT_TESTS = [
+    (
+        b"foo",
+        {
+            "sha256": "2c26b46b68ffc68ff99b453c1d30413413422d706483bfa0f98a5e886266e7ae",
+        },
+        True,
+    ),
+    (
+        b"foo",
+        {
+            "sha256": "2c26b46b68ffc68ff99b453c1d30413413422d706483bfa0f98a5e886266e7ae",
+            "blake2b_256": "0000000000000000000000000000000000000000000000000000000000000000",
+        },
+        True,
+    ),
+    (
+        b"foo",
+        {
+            "blake2b_256": "b8fe9f7f6255a6fa08f668ab632a8d081ad87983c77cd274e48ce450f0b349fd",
+        },
+        True,
+    ),
+    (
+        b"bar",
+        {
+            "blake2b_256": "b8fe9f7f6255a6fa08f668ab632a8d081ad87983c77cd274e48ce450f0b349fd",
+        },
+        False,
+    ),
+    (
+        b"foo",
+        {
+            "md5": "acbd18db4cc2f85cedef654fccc4a4d8",
+        },
+        False,
+    ),
+    (
+        b"foo",
+        {},
+        False,
+    ),
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("content, hashes, expected_match", HASH_DICT_TESTS)
+async def test_verify_a_hash(
+    content: bytes,
+    hashes: dict[str, str],
+    expected_match: bool,
+    tmp_path,
+):
+    filename = tmp_path / "file"
+    filename.write_bytes(content)
+    result = await verify_a_hash(filename, hashes)
+    assert result is expected_match
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("concurrency", [None, 1])
+async def test_verify_many(concurrency, tmp_path):
+    files_and_digests = []
+    for index, (content, hashes, _) in enumerate(HASH_DICT_TESTS):
+        filename = tmp_path / f"file{index}"
+        filename.write_bytes(content)
+        files_and_digests.append((filename, hashes))
+    result = await verify_many(files_and_digests, concurrency=concurrency)
+    assert result == [expected_match for _, _, expected_match in HASH_DICT_TESTS]
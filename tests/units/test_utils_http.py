@@ -0,0 +1,55 @@
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: Ansible Project
+
+import asyncio
+import warnings
+from unittest import mock
+
+import pytest
+
+from antsibull_core.utils.http import retry_get
+
+
+def _create_session(status_codes):
+    responses = []
+    for status_code in status_codes:
+        response = mock.MagicMock()
+        response.status = status_code
+        responses.append(response)
+    session = mock.MagicMock()
+    session.get = mock.AsyncMock(side_effect=responses)
+    return session
+
+
+@pytest.mark.asyncio
+async def test_retry_get(monkeypatch):
+    monkeypatch.setattr(asyncio, "sleep", mock.AsyncMock())
+    session = _create_session([500, 404, 200])
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        async with retry_get(session, "https://example.com", max_retries=3) as resp:
+            assert resp.status == 200
+
+    assert session.get.call_count == 3
+    assert asyncio.sleep.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_retry_get_fail(monkeypatch):
+    monkeypatch.setattr(asyncio, "sleep", mock.AsyncMock())
+    session = _create_session([500, 502, 503])
+
+    with pytest.warns(UserWarning) as record:
+        with pytest.raises(RuntimeError, match="received status codes 500, 502, 503$"):
+            async with retry_get(session, "https://example.com", max_retries=3):
+                pass
+
+    assert len(record) == 1
+    assert str(record[0].message) == (
+        "aio_session.get('https://example.com') failed 3 times"
+        " with status codes 500, 502, 503, finally failed."
+    )
+    assert session.get.call_count == 3
+    assert asyncio.sleep.call_count == 2
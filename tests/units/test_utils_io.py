@@ -0,0 +1,97 @@
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: Ansible Project
+
+import os
+
+import pytest
+
+import antsibull_core.app_context as ap
+from antsibull_core.utils.io import copy_file, read_file, write_file
+
+
+@pytest.mark.asyncio
+async def test_copy_file(tmp_path):
+    source = tmp_path / "source"
+    dest = tmp_path / "dest"
+    source.write_bytes(b"foo")
+    await copy_file(source, dest)
+    assert dest.read_bytes() == b"foo"
+
+    source.write_bytes(b"bar")
+    await copy_file(source, dest)
+    assert dest.read_bytes() == b"bar"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("check_content", [True, False])
+async def test_copy_file_same_file(tmp_path, check_content):
+    source = tmp_path / "source"
+    source.write_bytes(b"foo")
+    os.link(source, tmp_path / "hardlink")
+
+    await copy_file(source, source, check_content=check_content)
+    assert source.read_bytes() == b"foo"
+
+    await copy_file(source, tmp_path / "hardlink", check_content=check_content)
+    assert source.read_bytes() == b"foo"
+
+
+@pytest.mark.asyncio
+async def test_copy_file_trust_size_and_mtime(tmp_path):
+    source = tmp_path / "source"
+    dest = tmp_path / "dest"
+    source.write_bytes(b"foo")
+    await copy_file(source, dest, trust_size_and_mtime=True)
+    assert dest.read_bytes() == b"foo"
+    assert os.stat(dest).st_mtime_ns == os.stat(source).st_mtime_ns
+
+    # Same size and modification time: the destination is not touched
+    stat = os.stat(source)
+    dest.write_bytes(b"baz")
+    os.utime(dest, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    await copy_file(source, dest, trust_size_and_mtime=True)
+    assert dest.read_bytes() == b"baz"
+
+    # Without trusting size and modification time, the content is compared
+    await copy_file(source, dest)
+    assert dest.read_bytes() == b"foo"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "existing, content, file_check_content, written",
+    [
+        (None, "foo", 262144, True),
+        ("", "", 262144, False),
+        ("foo bar baz", "foo bar baz", 262144, False),
+        ("foo bar baz", "foo bar bam", 262144, True),
+        ("fab bar baz", "foo bar baz", 262144, True),
+        ("foo bar baz", "foo bar", 262144, True),
+        ("foo bar", "foo bar baz", 262144, True),
+        ("foo bar baz", "foo bar baz", 0, True),
+        ("foo bar baz", "foo bar baz", 10, True),
+    ],
+)
+async def test_write_file(tmp_path, existing, content, file_check_content, written):
+    filename = tmp_path / "file"
+    if existing is not None:
+        filename.write_text(existing)
+        os.utime(filename, ns=(0, 0))
+
+    data = ap.create_contexts(
+        cfg={"chunksize": 2, "file_check_content": file_check_content}
+    )
+    with ap.lib_context(data.lib_ctx):
+        await write_file(filename, content)
+
+    assert filename.read_text() == content
+    assert (os.stat(filename).st_mtime_ns != 0) == written
+
+
+@pytest.mark.asyncio
+async def test_read_file(tmp_path):
+    filename = tmp_path / "file"
+    filename.write_bytes("foo\nbär\n".encode("utf-8"))
+    assert await read_file(filename) == "foo\nbär\n"
+    assert await read_file(filename, encoding="latin-1") == "foo\nbÃ¤r\n"
@@ -0,0 +1,82 @@
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: Ansible Project
+
+import pytest
+
+from antsibull_core.vendored.json_utils import _filter_non_json_lines
+
+FILTER_NON_JSON_LINES_DATA = [
+    ('{"a": 1}', '{"a": 1}', []),
+    ("[1, 2]\n", "[1, 2]", []),
+    ('  {"a": 1}  \n', '  {"a": 1}  ', []),
+    ('MOTD\nmore junk [\n{\n  "a": [1]\n}\n', '{\n  "a": [1]\n}', []),
+    ("junk {\n\t[1,\n 2]\n", "\t[1,\n 2]", []),
+    ('{"a": 1}\n\n  \n', '{"a": 1}', []),
+    (
+        '{"a": 1}\nShared connection closed.\n',
+        '{"a": 1}',
+        [
+            "Module invocation had junk after the JSON data: Shared connection closed.",
+        ],
+    ),
+    (
+        '{"a": 1}\n}\nfoo\nbar\n',
+        '{"a": 1}\n}',
+        [
+            "Module invocation had junk after the JSON data: foo\nbar",
+        ],
+    ),
+    (
+        '{"a": 1}\n]\n',
+        '{"a": 1}',
+        [
+            "Module invocation had junk after the JSON data: ]",
+        ],
+    ),
+    (
+        '{"a": "}"}\nfoo } bar\n',
+        '{"a": "}"}',
+        [
+            "Module invocation had junk after the JSON data: foo } bar",
+        ],
+    ),
+    (
+        'MOTD\r{"a": 1}\rjunk\r',
+        '{"a": 1}',
+        [
+            "Module invocation had junk after the JSON data: junk",
+        ],
+    ),
+    (
+        'MOTD\r\n{\r\n  "a": 1\r\n}\r\nfoo\r\nbar\r\n',
+        '{\n  "a": 1\n}',
+        [
+            "Module invocation had junk after the JSON data: foo\nbar",
+        ],
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "data, expected, expected_warnings", FILTER_NON_JSON_LINES_DATA
+)
+def test_filter_non_json_lines(data, expected, expected_warnings):
+    result, warnings = _filter_non_json_lines(data)
+    assert result == expected
+    assert warnings == expected_warnings
+
+
+@pytest.mark.parametrize(
+    "data, message",
+    [
+        ("", "No start of json char found"),
+        ("foo\nbar {\n", "No start of json char found"),
+        ("{\nfoo\n", "No end of json char found"),
+        ("[\n}\n", "No end of json char found"),
+        ('{"a": "}}}"} Connection closed.\n', "No end of json char found"),
+    ],
+)
+def test_filter_non_json_lines_fail(data, message):
+    with pytest.raises(ValueError, match=f"^{message}$"):
+        _filter_non_json_lines(data)
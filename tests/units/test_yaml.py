@@ -0,0 +1,126 @@
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: Ansible Project
+
+import io
+import os
+from unittest import mock
+
+import pytest
+import yaml
+
+from antsibull_core.yaml import (
+    _SafeDumper,
+    iter_yaml_documents,
+    load_yaml_bytes,
+    load_yaml_file,
+    store_yaml_file,
+    store_yaml_stream,
+)
+
+SHARED = ["a", "b"]
+
+STORE_YAML_DATA = [
+    (
+        {"b": 1, "a": SHARED, "c": SHARED},
+        {},
+        "a:\n- a\n- b\nb: 1\nc:\n- a\n- b\n",
+    ),
+    (
+        {"b": 1, "a": SHARED, "c": SHARED},
+        {"nice": True},
+        "---\na:\n  - a\n  - b\nb: 1\nc:\n  - a\n  - b\n",
+    ),
+    (
+        {"b": 1, "a": SHARED},
+        {"sort_keys": False},
+        "b: 1\na:\n- a\n- b\n",
+    ),
+]
+
+
+@pytest.mark.parametrize("content, kwargs, expected", STORE_YAML_DATA)
+def test_store_yaml_stream(content, kwargs, expected):
+    stream = io.BytesIO()
+    store_yaml_stream(stream, content, **kwargs)
+    assert stream.getvalue().decode("utf-8") == expected
+    assert load_yaml_bytes(stream.getvalue()) == content
+
+
+@pytest.mark.parametrize("content, kwargs, expected", STORE_YAML_DATA)
+def test_store_yaml_file(content, kwargs, expected, tmp_path):
+    path = tmp_path / "file.yaml"
+    store_yaml_file(path, content, **kwargs)
+    assert path.read_text() == expected
+    assert load_yaml_file(path) == content
+
+
+@pytest.mark.parametrize("nice", [False, True])
+def test_store_yaml_keeps_pyyaml_dumpers(nice):
+    # antsibull_core.yaml uses its own dumper subclasses instead of modifying PyYAML's
+    # dumpers. Other code in the process, like antsibull_fileutils.yaml, might modify them,
+    # so only compare against their state before storing.
+    dumpers = (yaml.SafeDumper, _SafeDumper)
+    before = [vars(dumper).get("ignore_aliases") for dumper in dumpers]
+    store_yaml_stream(io.BytesIO(), {"a": SHARED, "c": SHARED}, nice=nice)
+    assert [vars(dumper).get("ignore_aliases") for dumper in dumpers] == before
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        ("", []),
+        ("a: 1\n", [{"a": 1}]),
+        ("---\na: 1\n---\n- b\n...\n---\nc\n", [{"a": 1}, ["b"], "c"]),
+    ],
+)
+def test_iter_yaml_documents(data, expected, tmp_path):
+    path = tmp_path / "file.yaml"
+    path.write_text(data)
+    assert list(iter_yaml_documents(path)) == expected
+
+
+def test_load_yaml_bytes():
+    assert load_yaml_bytes(b"a:\n- 1\n") == {"a": [1]}
+    with pytest.raises(yaml.constructor.ConstructorError):
+        load_yaml_bytes(b"!!python/object/apply:os.getcwd []")
+    # The loader cannot be replaced by an unsafe one
+    with pytest.raises(TypeError):
+        load_yaml_bytes(b"!!python/object/apply:os.getcwd []", Loader=yaml.UnsafeLoader)
+
+
+def test_load_yaml_file_cache(tmp_path):
+    path = tmp_path / "file.yaml"
+    path.write_text("a:\n- 1\n")
+    with mock.patch(
+        "antsibull_core.yaml.load_yaml_bytes", wraps=load_yaml_bytes
+    ) as load:
+        # Recently modified files are not cached
+        assert load_yaml_file(path) == {"a": [1]}
+        assert load_yaml_file(path) == {"a": [1]}
+        assert load.call_count == 2
+
+        os.utime(path, ns=(0, 0))
+        first = load_yaml_file(path)
+        first["a"].append(2)
+        assert load_yaml_file(path) == {"a": [1]}
+        assert load.call_count == 3
+
+        # Changing the file invalidates the cache, even with the same size and mtime
+        path.write_text("a:\n- 3\n")
+        os.utime(path, ns=(0, 0))
+        assert load_yaml_file(path) == {"a": [3]}
+        assert load.call_count == 4
+
+
+def test_load_yaml_file_error(tmp_path):
+    path = tmp_path / "file.yaml"
+    path.write_text("[ invalid yaml\n")
+    with pytest.raises(yaml.YAMLError) as exc:
+        load_yaml_file(path)
+    assert str(exc.value) == (
+        "while parsing a flow sequence\n"
+        f'  in "{path}", line 1, column 1\n'
+        "did not find expected ',' or ']'\n"
+        f'  in "{path}", line 2, column 1'
+    )